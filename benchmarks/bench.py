@@ -0,0 +1,72 @@
+"""Benchmark the injected HideUI script on synthetic Gradio-like pages
+
+Usage: python benchmarks/bench.py [size ...] [--repeat N] [--config PATH]
+
+Builds the script exactly as the plugin does (inject_floating_buttons_js,
+with the bundle inlined) and runs it under node against fixtures of
+1k, 10k and 50k component nodes by default. Needs only Python and node.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import types
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PLUGIN_PATH = os.path.join(os.path.dirname(BENCH_DIR), "plugin.py")
+
+
+def load_plugin_module():
+    """Import plugin.py; WAN2GP and gradio are replaced by empty modules when absent"""
+    try:
+        import gradio  # noqa: F401
+        import shared.utils.plugins  # noqa: F401
+    except ImportError:
+        # Script generation never touches gradio or the plugin base class
+        plugins = types.ModuleType("shared.utils.plugins")
+        plugins.WAN2GPPlugin = type("WAN2GPPlugin", (), {})
+        sys.modules.setdefault("gradio", types.ModuleType("gradio"))
+        sys.modules.setdefault("shared", types.ModuleType("shared"))
+        sys.modules.setdefault("shared.utils", types.ModuleType("shared.utils"))
+        sys.modules["shared.utils.plugins"] = plugins
+    spec = importlib.util.spec_from_file_location("hideui_plugin", PLUGIN_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_script(config_path=None):
+    """Return the script the plugin would inject, optionally for another config file"""
+    module = load_plugin_module()
+    plugin = module.MobileTogglePlugin()
+    if config_path:
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+        plugin.load_config = lambda: config
+    return plugin.inject_floating_buttons_js()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size; the median is reported")
+    parser.add_argument("--config", help="config.json to benchmark instead of the shipped one")
+    args = parser.parse_args()
+
+    script = build_script(args.config)
+    with tempfile.NamedTemporaryFile('w', suffix='.js', delete=False, encoding='utf-8') as f:
+        f.write(script)
+        script_path = f.name
+    try:
+        command = ["node", os.path.join(BENCH_DIR, "run.js"), script_path,
+                   *map(str, args.sizes), "--repeat", str(args.repeat)]
+        return subprocess.call(command)
+    finally:
+        os.remove(script_path)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,521 @@
+"use strict";
+// Minimal synthetic DOM, just enough to run static/hideui.js under node.
+// It models selectors, events, MutationObserver, localStorage and
+// display:none from <style> rules; innerText reads are counted because
+// they stand in for layout work in a real browser.
+
+const counters = { innerText: 0, layout: 0 };
+
+class ClassList {
+    constructor(el) { this.el = el; }
+    _get() { return (this.el.getAttribute("class") || "").split(/\s+/).filter(Boolean); }
+    _set(list) { this.el.setAttribute("class", list.join(" ")); }
+    contains(c) { return this._get().includes(c); }
+    add(...cs) { const l = this._get(); cs.forEach(c => { if (!l.includes(c)) l.push(c); }); this._set(l); }
+    remove(...cs) { this._set(this._get().filter(c => !cs.includes(c))); }
+    toggle(c, force) {
+        const has = this.contains(c);
+        const want = force === undefined ? !has : !!force;
+        if (want && !has) this.add(c);
+        if (!want && has) this.remove(c);
+        return want;
+    }
+}
+
+function camelToKebab(s) { return s.replace(/[A-Z]/g, m => "-" + m.toLowerCase()); }
+function kebabToCamel(s) { return s.replace(/-([a-z])/g, (_, c) => c.toUpperCase()); }
+
+function makeStyle(el) {
+    const data = {};
+    const api = {
+        setProperty(k, v) { data[kebabToCamel(k)] = String(v); el._styleChanged(); },
+        getPropertyValue(k) { return data[kebabToCamel(k)] || ""; },
+        removeProperty(k) { delete data[kebabToCamel(k)]; el._styleChanged(); },
+    };
+    return new Proxy(data, {
+        get(t, k) {
+            if (k in api) return api[k];
+            if (k === "cssText") return Object.entries(t).map(([a, b]) => `${camelToKebab(a)}: ${b};`).join(" ");
+            return t[k] === undefined ? "" : t[k];
+        },
+        set(t, k, v) {
+            if (k === "cssText") { Object.keys(t).forEach(x => delete t[x]); }
+            else if (v === "" || v === null) delete t[k];
+            else t[k] = String(v);
+            el._styleChanged();
+            return true;
+        },
+    });
+}
+
+function makeDataset(el) {
+    return new Proxy({}, {
+        get(_, k) { return typeof k === "string" ? el.getAttribute("data-" + camelToKebab(k)) ?? undefined : undefined; },
+        set(_, k, v) { el.setAttribute("data-" + camelToKebab(k), String(v)); return true; },
+        deleteProperty(_, k) { el.removeAttribute("data-" + camelToKebab(k)); return true; },
+        has(_, k) { return el.hasAttribute("data-" + camelToKebab(k)); },
+    });
+}
+
+// --- SELECTORS ---
+function parseSelectorList(sel) {
+    const groups = [];
+    let depth = 0, quote = null, cur = "";
+    for (const ch of sel) {
+        if (quote) { cur += ch; if (ch === quote) quote = null; continue; }
+        if (ch === "'" || ch === '"') { quote = ch; cur += ch; continue; }
+        if (ch === "(" || ch === "[") depth++;
+        if (ch === ")" || ch === "]") depth--;
+        if (ch === "," && depth === 0) { groups.push(cur.trim()); cur = ""; continue; }
+        cur += ch;
+    }
+    if (cur.trim()) groups.push(cur.trim());
+    return groups.map(parseComplex);
+}
+
+function parseComplex(sel) {
+    // returns [{compound, combinator}] right-to-left friendly
+    const parts = [];
+    let i = 0, cur = "", depth = 0, quote = null, comb = null;
+    const push = () => { if (cur.trim()) { parts.push({ comb, compound: parseCompound(cur.trim()) }); comb = null; } cur = ""; };
+    while (i < sel.length) {
+        const ch = sel[i];
+        if (quote) { cur += ch; if (ch === quote) quote = null; i++; continue; }
+        if (ch === "'" || ch === '"') { quote = ch; cur += ch; i++; continue; }
+        if (ch === "(" || ch === "[") depth++;
+        if (ch === ")" || ch === "]") depth--;
+        if (depth === 0 && (ch === ">" || ch === " " || ch === "+" || ch === "~")) {
+            if (ch === "~" && sel[i + 1] === "=") { cur += ch; i++; continue; }
+            push();
+            if (ch !== " ") comb = ch;
+            else if (comb === null && parts.length) comb = comb || " ";
+            i++;
+            continue;
+        }
+        cur += ch; i++;
+    }
+    push();
+    parts.forEach((p, idx) => { if (idx > 0 && !p.comb) p.comb = " "; });
+    return parts;
+}
+
+function parseCompound(s) {
+    const tests = [];
+    const re = /(\*)|([a-zA-Z][\w-]*)|#([\w-]+)|\.([\w-]+)|\[([\w-]+)(?:([~^$*|]?=)(?:"([^"]*)"|'([^']*)'|([^\]]*)))?\]|:not\(([^)]*)\)/g;
+    let m;
+    while ((m = re.exec(s))) {
+        if (m[1]) continue;
+        if (m[2]) { const t = m[2].toUpperCase(); tests.push(el => el.tagName === t); }
+        else if (m[3]) { const v = m[3]; tests.push(el => el.id === v); }
+        else if (m[4]) { const v = m[4]; tests.push(el => el.classList.contains(v)); }
+        else if (m[5]) {
+            const name = m[5], op = m[6], val = m[7] ?? m[8] ?? m[9];
+            tests.push(el => {
+                const a = el.getAttribute(name);
+                if (a === null) return false;
+                if (!op) return true;
+                if (op === "=") return a === val;
+                if (op === "^=") return a.startsWith(val);
+                if (op === "$=") return a.endsWith(val);
+                if (op === "*=") return a.includes(val);
+                if (op === "~=") return a.split(/\s+/).includes(val);
+                return false;
+            });
+        } else if (m[10] !== undefined) {
+            const inner = parseSelectorList(m[10]);
+            tests.push(el => !inner.some(c => matchComplex(el, c)));
+        }
+    }
+    return el => tests.every(t => t(el));
+}
+
+function matchComplex(el, parts, idx = parts.length - 1) {
+    if (!parts[idx].compound(el)) return false;
+    if (idx === 0) return true;
+    const comb = parts[idx].comb;
+    if (comb === ">") return !!el.parentElement && matchComplex(el.parentElement, parts, idx - 1);
+    let p = el.parentElement;
+    while (p) { if (matchComplex(p, parts, idx - 1)) return true; p = p.parentElement; }
+    return false;
+}
+
+const selectorCache = new Map();
+function compile(sel) {
+    let c = selectorCache.get(sel);
+    if (!c) { c = parseSelectorList(sel); selectorCache.set(sel, c); }
+    return c;
+}
+function matches(el, sel) { return compile(sel).some(c => matchComplex(el, c)); }
+
+// --- NODES ---
+class Node {
+    constructor(doc) { this.ownerDocument = doc; this.parentNode = null; this.childNodes = []; this._listeners = {}; }
+    get parentElement() { return this.parentNode && this.parentNode.nodeType === 1 ? this.parentNode : null; }
+    get firstChild() { return this.childNodes[0] || null; }
+    get lastChild() { return this.childNodes[this.childNodes.length - 1] || null; }
+    get nextSibling() { if (!this.parentNode) return null; const s = this.parentNode.childNodes; return s[s.indexOf(this) + 1] || null; }
+    get isConnected() { let n = this; while (n.parentNode) n = n.parentNode; return n === this.ownerDocument; }
+    appendChild(c) { return this.insertBefore(c, null); }
+    insertBefore(c, ref) {
+        if (c.nodeType === 11) { [...c.childNodes].forEach(x => this.insertBefore(x, ref)); return c; }
+        if (c.parentNode) c.parentNode.removeChild(c);
+        const idx = ref ? this.childNodes.indexOf(ref) : -1;
+        if (idx === -1) this.childNodes.push(c); else this.childNodes.splice(idx, 0, c);
+        c.parentNode = this;
+        this.ownerDocument._record({ type: "childList", target: this, addedNodes: [c], removedNodes: [] });
+        return c;
+    }
+    removeChild(c) {
+        const i = this.childNodes.indexOf(c);
+        if (i !== -1) this.childNodes.splice(i, 1);
+        c.parentNode = null;
+        this.ownerDocument._record({ type: "childList", target: this, addedNodes: [], removedNodes: [c] });
+        return c;
+    }
+    replaceChild(n, o) { this.insertBefore(n, o); this.removeChild(o); return o; }
+    remove() { if (this.parentNode) this.parentNode.removeChild(this); }
+    contains(o) { while (o) { if (o === this) return true; o = o.parentNode; } return false; }
+    get textContent() { return this.childNodes.map(c => c.textContent).join(""); }
+    set textContent(v) {
+        [...this.childNodes].forEach(c => this.removeChild(c));
+        if (v !== "" && v != null) this.appendChild(this.ownerDocument.createTextNode(String(v)));
+    }
+    addEventListener(t, fn, opts) { (this._listeners[t] = this._listeners[t] || []).push({ fn, capture: opts === true || (opts && opts.capture) }); }
+    removeEventListener(t, fn, opts) {
+        const cap = opts === true || (opts && opts.capture);
+        this._listeners[t] = (this._listeners[t] || []).filter(l => !(l.fn === fn && !!l.capture === !!cap));
+    }
+    dispatchEvent(ev) {
+        ev.target = ev.target || this;
+        const path = [];
+        let n = this;
+        while (n) { path.push(n); n = n.parentNode; }
+        path.push(this.ownerDocument.defaultView);
+        const fire = (node, capture) => {
+            ev.currentTarget = node;
+            const ls = (node._listeners && node._listeners[ev.type]) || [];
+            ls.filter(l => !!l.capture === capture).forEach(l => { if (!ev._stopped) l.fn.call(node, ev); });
+            const h = node["on" + ev.type];
+            if (!capture && typeof h === "function" && !ev._stopped) h.call(node, ev);
+        };
+        for (let i = path.length - 1; i >= 0 && !ev._stopped; i--) fire(path[i], true);
+        for (let i = 0; i < path.length && !ev._stopped; i++) { fire(path[i], false); if (!ev.bubbles) break; }
+        return !ev.defaultPrevented;
+    }
+}
+
+class Text extends Node {
+    constructor(doc, data) { super(doc); this.nodeType = 3; this._data = data; }
+    get textContent() { return this._data; }
+    set textContent(v) { this._data = String(v); this.ownerDocument._record({ type: "characterData", target: this }); }
+    get data() { return this._data; }
+    cloneNode() { return new Text(this.ownerDocument, this._data); }
+}
+
+class DocumentFragment extends Node {
+    constructor(doc) { super(doc); this.nodeType = 11; }
+    get children() { return this.childNodes.filter(c => c.nodeType === 1); }
+    get firstElementChild() { return this.children[0] || null; }
+    querySelectorAll(sel) { return Element.prototype.querySelectorAll.call(this, sel); }
+    querySelector(sel) { return this.querySelectorAll(sel)[0] || null; }
+    cloneNode(deep) { const f = new DocumentFragment(this.ownerDocument); if (deep) this.childNodes.forEach(c => f.appendChild(c.cloneNode(true))); return f; }
+}
+
+const HIDDEN_TAGS = new Set(["SCRIPT", "STYLE", "TEMPLATE"]);
+
+class Element extends Node {
+    constructor(doc, tag) {
+        super(doc);
+        this.nodeType = 1;
+        this.tagName = tag.toUpperCase();
+        this._attrs = new Map();
+        this.style = makeStyle(this);
+        this.dataset = makeDataset(this);
+        this.classList = new ClassList(this);
+        if (this.tagName === "TEMPLATE") this.content = new DocumentFragment(doc);
+    }
+    _styleChanged() { this.ownerDocument._record({ type: "attributes", attributeName: "style", target: this }); }
+    get id() { return this.getAttribute("id") || ""; }
+    set id(v) { this.setAttribute("id", v); }
+    get className() { return this.getAttribute("class") || ""; }
+    set className(v) { this.setAttribute("class", v); }
+    get title() { return this.getAttribute("title") || ""; }
+    set title(v) { this.setAttribute("title", v); }
+    get type() { return this.getAttribute("type") || ""; }
+    set type(v) { this.setAttribute("type", v); }
+    get hidden() { return this.hasAttribute("hidden"); }
+    set hidden(v) { if (v) this.setAttribute("hidden", ""); else this.removeAttribute("hidden"); }
+    getAttribute(n) { return this._attrs.has(n) ? this._attrs.get(n) : null; }
+    setAttribute(n, v) {
+        const old = this.getAttribute(n);
+        this._attrs.set(n, String(v));
+        if (n === "id") this.ownerDocument._idCacheDirty = true;
+        this.ownerDocument._record({ type: "attributes", attributeName: n, target: this, oldValue: old });
+    }
+    hasAttribute(n) { return this._attrs.has(n); }
+    removeAttribute(n) {
+        if (!this._attrs.has(n)) return;
+        const old = this._attrs.get(n);
+        this._attrs.delete(n);
+        if (n === "id") this.ownerDocument._idCacheDirty = true;
+        this.ownerDocument._record({ type: "attributes", attributeName: n, target: this, oldValue: old });
+    }
+    toggleAttribute(n, force) {
+        const want = force === undefined ? !this.hasAttribute(n) : !!force;
+        if (want) this.setAttribute(n, ""); else this.removeAttribute(n);
+        return want;
+    }
+    get children() { return this.childNodes.filter(c => c.nodeType === 1); }
+    get firstElementChild() { return this.children[0] || null; }
+    get childElementCount() { return this.children.length; }
+    get nextElementSibling() {
+        if (!this.parentNode) return null;
+        const s = this.parentNode.children;
+        return s[s.indexOf(this) + 1] || null;
+    }
+    get previousElementSibling() {
+        if (!this.parentNode) return null;
+        const s = this.parentNode.children;
+        return s[s.indexOf(this) - 1] || null;
+    }
+    _hiddenByStyle() {
+        if (this.style.display === "none" || HIDDEN_TAGS.has(this.tagName)) return true;
+        return this.ownerDocument._sheetHides(this);
+    }
+    get innerText() {
+        counters.innerText++;
+        counters.layout++;
+        const walk = (n) => {
+            if (n.nodeType === 3) return n._data;
+            if (n.nodeType !== 1 || (n !== this && n._hiddenByStyle())) return "";
+            const inner = n.childNodes.map(walk).join("");
+            return /^(DIV|P|H[1-6]|LABEL|BUTTON)$/.test(n.tagName) ? inner + "\n" : inner;
+        };
+        return walk(this);
+    }
+    set innerText(v) { this.textContent = v; }
+    get innerHTML() { return ""; }
+    set innerHTML(v) {
+        [...this.childNodes].forEach(c => this.removeChild(c));
+        if (v) this.ownerDocument._parseInto(this, v);
+    }
+    get value() { return this._value !== undefined ? this._value : (this.getAttribute("value") || ""); }
+    set value(v) { this._value = String(v); }
+    get checked() { return !!this._checked; }
+    set checked(v) { this._checked = !!v; }
+    get draggable() { return this.getAttribute("draggable") === "true"; }
+    set draggable(v) { this.setAttribute("draggable", v ? "true" : "false"); }
+    matches(sel) { return matches(this, sel); }
+    closest(sel) { let n = this; while (n && n.nodeType === 1) { if (matches(n, sel)) return n; n = n.parentNode; } return null; }
+    querySelectorAll(sel) {
+        const out = [];
+        const c = compile(sel);
+        const walk = (n) => {
+            for (const ch of n.childNodes) {
+                if (ch.nodeType !== 1) continue;
+                if (c.some(x => matchComplex(ch, x))) out.push(ch);
+                walk(ch);
+            }
+        };
+        walk(this);
+        return out;
+    }
+    querySelector(sel) { return this.querySelectorAll(sel)[0] || null; }
+    getElementsByTagName(t) { return this.querySelectorAll(t); }
+    getBoundingClientRect() {
+        counters.layout++;
+        const r = this._rect || { left: 0, top: 0, width: 0, height: 0 };
+        return { ...r, x: r.left, y: r.top, right: r.left + r.width, bottom: r.top + r.height };
+    }
+    get offsetParent() { return this.style.display === "none" ? null : this.parentElement; }
+    get offsetWidth() { return this._rect ? this._rect.width : 0; }
+    get offsetHeight() { return this._rect ? this._rect.height : 0; }
+    cloneNode(deep) {
+        const e = this.ownerDocument.createElement(this.tagName.toLowerCase());
+        this._attrs.forEach((v, k) => e._attrs.set(k, v));
+        if (deep) this.childNodes.forEach(c => e.appendChild(c.cloneNode(true)));
+        if (this.content) e.content = this.content.cloneNode(true);
+        return e;
+    }
+    focus() { this.ownerDocument.activeElement = this; }
+    blur() {}
+    click() { this.dispatchEvent(new Event("click", { bubbles: true })); }
+    select() {}
+    scrollIntoView() {}
+}
+
+class Event {
+    constructor(type, init = {}) { this.type = type; this.bubbles = !!init.bubbles; this.defaultPrevented = false; Object.assign(this, init.detail ? { detail: init.detail } : {}); }
+    preventDefault() { this.defaultPrevented = true; }
+    stopPropagation() { this._stopped = true; }
+    stopImmediatePropagation() { this._stopped = true; }
+}
+class CustomEvent extends Event { constructor(t, i = {}) { super(t, i); this.detail = i.detail; } }
+
+class Document extends Node {
+    constructor() {
+        super(null);
+        this.ownerDocument = this;
+        this.nodeType = 9;
+        this._observers = [];
+        this._idCacheDirty = true;
+        this.readyState = "complete";
+        this.documentElement = this.createElement("html");
+        this.appendChild(this.documentElement);
+        this.head = this.createElement("head");
+        this.body = this.createElement("body");
+        this.documentElement.appendChild(this.head);
+        this.documentElement.appendChild(this.body);
+    }
+    get children() { return this.childNodes.filter(c => c.nodeType === 1); }
+    createElement(t) { return new Element(this, t); }
+    createTextNode(d) { return new Text(this, d); }
+    createDocumentFragment() { return new DocumentFragment(this); }
+    getElementById(id) {
+        if (this._idCacheDirty) {
+            this._ids = new Map();
+            const walk = (n) => { for (const c of n.childNodes) if (c.nodeType === 1) { if (c._attrs.has("id") && !this._ids.has(c.id)) this._ids.set(c.id, c); walk(c); } };
+            walk(this);
+            this._idCacheDirty = false;
+        }
+        const e = this._ids.get(id);
+        if (e && e.isConnected && e.id === id) return e;
+        if (e) { this._idCacheDirty = true; return this.getElementById(id); }
+        return null;
+    }
+    querySelectorAll(s) { return Element.prototype.querySelectorAll.call(this, s); }
+    querySelector(s) { return this.querySelectorAll(s)[0] || null; }
+    execCommand() { return true; }
+    _record(rec) {
+        if (rec.type === "childList") this._idCacheDirty = true;
+        if (!this._observers.length) return;
+        const t = rec.target;
+        for (const o of this._observers) {
+            for (const { node, opts } of o._targets) {
+                const inScope = opts.subtree ? node.contains(t) : node === t;
+                if (!inScope) continue;
+                if (rec.type === "childList" && !opts.childList) continue;
+                if (rec.type === "characterData" && !opts.characterData) continue;
+                if (rec.type === "attributes") {
+                    if (!opts.attributes && !opts.attributeFilter) continue;
+                    if (opts.attributeFilter && !opts.attributeFilter.includes(rec.attributeName)) continue;
+                }
+                o._queue(rec);
+                break;
+            }
+        }
+    }
+    _sheetHides(el) {
+        if (!this._sheetRules) return false;
+        for (const r of this._sheetRules) if (matches(el, r)) return true;
+        return false;
+    }
+    _rebuildSheet() {
+        const rules = [];
+        this.querySelectorAll("style").forEach(s => {
+            const txt = s.textContent.replace(/\/\*[\s\S]*?\*\//g, "");
+            const re = /([^{}]+)\{([^}]*)\}/g;
+            let m;
+            while ((m = re.exec(txt))) if (/display\s*:\s*none/.test(m[2])) rules.push(m[1].trim());
+        });
+        this._sheetRules = rules;
+    }
+    _parseInto(parent, html) {
+        // Only the trivial markup used by the script: tags, attributes, text
+        const re = /<\/?([a-zA-Z0-9]+)([^>]*)>|([^<]+)/g;
+        const stack = [parent];
+        let m;
+        while ((m = re.exec(html))) {
+            const top = stack[stack.length - 1];
+            if (m[3]) { top.appendChild(this.createTextNode(m[3])); continue; }
+            if (m[0][1] === "/") { stack.pop(); continue; }
+            const el = this.createElement(m[1]);
+            const attrRe = /([\w-]+)(?:="([^"]*)")?/g;
+            let a;
+            while ((a = attrRe.exec(m[2]))) el.setAttribute(a[1], a[2] ?? "");
+            (top.content && top.tagName === "TEMPLATE" ? top.content : top).appendChild(el);
+            if (!/\/$/.test(m[2].trim()) && !/^(input|br|img)$/i.test(m[1])) stack.push(el);
+        }
+    }
+}
+
+class MutationObserver {
+    constructor(cb) { this._cb = cb; this._targets = []; this._records = []; this._scheduled = false; }
+    observe(node, opts) { this._targets.push({ node, opts: opts || {} }); const d = node.ownerDocument || node; if (!d._observers.includes(this)) d._observers.push(this); this._doc = d; }
+    disconnect() { this._targets = []; this._records = []; if (this._doc) this._doc._observers = this._doc._observers.filter(o => o !== this); }
+    takeRecords() { const r = this._records; this._records = []; return r; }
+    _queue(rec) {
+        this._records.push({ addedNodes: [], removedNodes: [], ...rec });
+        if (!this._scheduled) {
+            this._scheduled = true;
+            queueMicrotask(() => {
+                this._scheduled = false;
+                const r = this.takeRecords();
+                if (r.length) this._cb(r, this);
+            });
+        }
+    }
+}
+
+class Storage {
+    constructor() { this._d = new Map(); this.writes = 0; }
+    getItem(k) { return this._d.has(k) ? this._d.get(k) : null; }
+    setItem(k, v) { this.writes++; this._d.set(k, String(v)); }
+    removeItem(k) { this._d.delete(k); }
+    clear() { this._d.clear(); }
+    get length() { return this._d.size; }
+    key(i) { return [...this._d.keys()][i] ?? null; }
+}
+
+function createWindow() {
+    const document = new Document();
+    const window = {
+        document,
+        localStorage: new Storage(),
+        performance: globalThis.performance,
+        console: globalThis.console,
+        scrollX: 0,
+        scrollY: 0,
+        innerWidth: 1920,
+        innerHeight: 1080,
+        location: { reload() { window.__reloaded = (window.__reloaded || 0) + 1; }, pathname: "/" },
+        setTimeout, clearTimeout, setInterval, clearInterval, queueMicrotask,
+        requestAnimationFrame: (fn) => setTimeout(() => fn(performance.now()), 0),
+        cancelAnimationFrame: (id) => clearTimeout(id),
+        requestIdleCallback: (fn) => setTimeout(() => fn({ didTimeout: false, timeRemaining: () => 10 }), 0),
+        cancelIdleCallback: (id) => clearTimeout(id),
+        MutationObserver, Event, CustomEvent, Node, Element, Text, DocumentFragment,
+        HTMLElement: Element,
+        JSON, Math, Date, Map, Set, WeakMap, WeakSet, Array, Object, String, Number, Promise,
+        prompt: () => null,
+        confirm: () => true,
+        alert: () => {},
+        getComputedStyle: (el) => ({ display: el._hiddenByStyle() ? "none" : (el.style.display || "block"), getPropertyValue: () => "" }),
+        CSS: { escape: (s) => String(s).replace(/[^\w-]/g, c => "\\" + c) },
+        _listeners: {},
+        addEventListener: Node.prototype.addEventListener,
+        removeEventListener: Node.prototype.removeEventListener,
+        dispatchEvent(ev) { ev.target = ev.target || window; ((this._listeners[ev.type]) || []).forEach(l => l.fn.call(window, ev)); return true; },
+    };
+    window.window = window;
+    window.self = window;
+    window.globalThis = window;
+    document.defaultView = window;
+    // Style elements re-evaluate their rules whenever their text changes.
+    const origRecord = document._record.bind(document);
+    document._record = (rec) => {
+        let n = rec.target;
+        while (n && n.nodeType !== 1) n = n.parentNode;
+        if (n && (n.tagName === "STYLE" || (n.closest && n.closest("style")) || (rec.addedNodes || []).concat(rec.removedNodes || []).some(x => x.tagName === "STYLE"))) document._rebuildSheet();
+        origRecord(rec);
+    };
+    return window;
+}
+
+function runScript(window, code) {
+    const names = Object.keys(window).filter(k => /^[A-Za-z_$][\w$]*$/.test(k) && k !== "window");
+    const fn = new Function("window", ...names, code);
+    return fn(window, ...names.map(k => window[k]));
+}
+
+module.exports = { createWindow, runScript, counters, Event, CustomEvent };
@@ -0,0 +1,77 @@
+"use strict";
+// Gradio-like page fixtures: tabs of rows and columns holding labelled
+// blocks, every container and block carrying a component-<n> id. The
+// shipped config.json labels are spread through the tree so targets
+// resolve the way they do in WAN2GP.
+
+const CONFIG_LABELS = [
+    "WanGP by DeepBeepMeep", "Attention Mode", "Location Start Video", "End Image",
+    "Video to Video", "Enhance Prompt", "Resolution", "Category", "Number of Frames",
+    "Number of Inference Steps", "Reset Settings", "Set Settings as Default",
+    "Load Settings From Video", "Download Lora", "Lora URL", "Video Info"
+];
+
+function buildPage(window, size) {
+    const doc = window.document;
+    let nextId = 1;
+    let count = 0;
+
+    function component(tag, className, parent) {
+        const el = doc.createElement(tag);
+        el.id = `component-${nextId++}`;
+        if (className) el.className = className;
+        parent.appendChild(el);
+        count++;
+        return el;
+    }
+
+    function block(parent, labelText) {
+        const el = component("div", "block", parent);
+        const label = doc.createElement("label");
+        const span = doc.createElement("span");
+        span.setAttribute("data-testid", "block-label");
+        span.textContent = labelText;
+        label.appendChild(span);
+        el.appendChild(label);
+        const input = doc.createElement("input");
+        input.type = "text";
+        el.appendChild(input);
+        return el;
+    }
+
+    const root = doc.createElement("div");
+    root.className = "gradio-container";
+    doc.body.appendChild(root);
+
+    const header = component("div", "html", root);
+    const title = doc.createElement("h1");
+    title.textContent = CONFIG_LABELS[0];
+    header.appendChild(title);
+
+    // One config label every `spacing` blocks, the rest are filler
+    const spacing = Math.max(1, Math.floor(size / (CONFIG_LABELS.length * 4)));
+    let blockIndex = 0;
+    while (count < size) {
+        const tab = component("div", "tabitem", root);
+        for (let r = 0; r < 8 && count < size; r++) {
+            const row = component("div", "row", tab);
+            for (let c = 0; c < 3 && count < size; c++) {
+                const column = component("div", "column", row);
+                for (let b = 0; b < 6 && count < size; b++) {
+                    const labelIndex = blockIndex % spacing === 0 ? (blockIndex / spacing) % CONFIG_LABELS.length : -1;
+                    block(column, labelIndex > 0 ? CONFIG_LABELS[labelIndex] : `Setting ${blockIndex}`);
+                    blockIndex++;
+                }
+            }
+        }
+    }
+
+    const buttons = component("div", "row", root);
+    ["Reset Settings", "Set Settings as Default"].forEach(text => {
+        const button = component("button", "lg", buttons);
+        button.textContent = text;
+    });
+    return count;
+}
+
+module.exports = { buildPage };
@@ -0,0 +1,98 @@
+"use strict";
+// Usage: node run.js <script.js> [size ...] [--repeat N]
+// Boots the script on a fresh synthetic page per size and repetition and
+// prints the median time and innerText reads for each phase.
+
+const fs = require("fs");
+const { createWindow, counters, Event } = require("./dom.js");
+const { buildPage } = require("./fixtures.js");
+const { start, tick } = require("../tests/harness.js");
+
+const PHASES = ["boot", "open menu", "show default", "hide all", "show all", "single toggle"];
+
+function parseArgs(argv) {
+    const args = { script: null, sizes: [], repeat: 3 };
+    for (let i = 0; i < argv.length; i++) {
+        if (argv[i] === "--repeat") args.repeat = Math.max(1, parseInt(argv[++i], 10) || 1);
+        else if (args.script === null) args.script = argv[i];
+        else args.sizes.push(parseInt(argv[i], 10));
+    }
+    if (args.sizes.length === 0) args.sizes = [1000, 10000, 50000];
+    return args;
+}
+
+function measure(fn) {
+    const reads = counters.innerText;
+    const start = performance.now();
+    fn();
+    return { ms: performance.now() - start, reads: counters.innerText - reads };
+}
+
+function menuButton(doc, text) {
+    const button = doc.querySelectorAll("#floating-menu button").find(b => b.textContent === text);
+    if (!button) throw new Error(`menu button "${text}" not found`);
+    return button;
+}
+
+async function runOnce(code, size) {
+    const window = createWindow();
+    const doc = window.document;
+    const nodes = buildPage(window, size);
+    const results = {};
+    results["boot"] = measure(() => start(window, code));
+    if (!window.__hideuiLifecycle || !window.__hideuiLifecycle.booted) {
+        throw new Error("script did not boot");
+    }
+    await tick();
+
+    // The menu rows are built on first open
+    results["open menu"] = measure(() => doc.querySelector("#floating-toggle-container > button").click());
+    await tick();
+    results["show default"] = measure(() => menuButton(doc, "Show Default").click());
+    await tick();
+    const toggleAll = menuButton(doc, "Show/Hide All");
+    results["hide all"] = measure(() => toggleAll.click());
+    await tick();
+    results["show all"] = measure(() => toggleAll.click());
+    await tick();
+
+    const checkbox = doc.querySelector("#floating-menu input[type=checkbox]");
+    results["single toggle"] = measure(() => {
+        checkbox.checked = !checkbox.checked;
+        checkbox.dispatchEvent(new Event("change", { bubbles: true }));
+    });
+    await tick();
+    return { nodes, results };
+}
+
+function median(values) {
+    const sorted = values.slice().sort((a, b) => a - b);
+    return sorted[Math.floor(sorted.length / 2)];
+}
+
+async function main() {
+    const args = parseArgs(process.argv.slice(2));
+    if (!args.script) {
+        console.error("usage: node run.js <script.js> [size ...] [--repeat N]");
+        process.exit(2);
+    }
+    const code = fs.readFileSync(args.script, "utf8");
+
+    console.log(["nodes", ...PHASES.map(p => `${p} ms (reads)`)].join(" | "));
+    for (const size of args.sizes) {
+        const runs = [];
+        for (let i = 0; i < args.repeat; i++) runs.push(await runOnce(code, size));
+        const cells = PHASES.map(phase => {
+            const ms = median(runs.map(r => r.results[phase].ms));
+            const reads = median(runs.map(r => r.results[phase].reads));
+            return `${ms.toFixed(1)} (${reads})`;
+        });
+        console.log([runs[0].nodes, ...cells].join(" | "));
+    }
+    process.exit(0);
+}
+
+main().catch(e => {
+    console.error(e);
+    process.exit(1);
+});
@@ -1,1629 +1,416 @@
 import gradio as gr
 from shared.utils.plugins import WAN2GPPlugin
+import hashlib
 import json
 import os
+import pathlib
+import re
+import shutil
+import tempfile
+import threading
+import time
+import urllib.parse
+from collections import deque
 
 PlugIn_Name = "Mobile Toggle Helper"
 PlugIn_Id = "MobileToggleHelper"
 
+# Component the hidden save bridge is inserted after, and the minimum
+# number of seconds between two writes of config.json
+SAVE_BRIDGE_ANCHOR = "prompt"
+SAVE_BRIDGE_ID = "hideui-save-bridge"
+SAVE_INTERVAL = 1.0
+
+# The browser script lives in static/ so it can be served as a cacheable
+# file; only the compiled config is inlined on each page load
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+BUNDLE_PATH = os.path.join(STATIC_DIR, "hideui.js")
+BUNDLE_LOADER = r"""
+(function(){
+    if (document.querySelector("script[data-hideui-bundle]")) return;
+    const script = document.createElement("script");
+    script.src = __BUNDLE_URL__;
+    script.dataset.hideuiBundle = "";
+    document.head.appendChild(script);
+})();
+"""
+
+# Hides default-hidden elements with a stable id before the first paint.
+# The browser script removes it once it has applied visibility itself.
+CRITICAL_STYLE_ID = "hideui-critical"
+CRITICAL_STYLE_LOADER = r"""
+(function(){
+    if (document.getElementById("__STYLE_ID__")) return;
+    const style = document.createElement("style");
+    style.id = "__STYLE_ID__";
+    style.textContent = __CRITICAL_CSS__;
+    (document.head || document.documentElement).appendChild(style);
+})();
+""".replace("__STYLE_ID__", CRITICAL_STYLE_ID)
+
+# Gradio's component-N ids follow the layout; elem_ids do not
+POSITIONAL_ID = re.compile(r"component-\d+")
+CSS_ID = re.compile(r"[A-Za-z_][\w-]*")
+
+
+def normalize_label(label):
+    """Collapse whitespace and lowercase, matching normalizeText() in the browser"""
+    return " ".join(str(label).split()).lower()
+
+
+def compile_config(config):
+    """Validate config.json and return (normalized config, list of warnings)"""
+    warnings = []
+    if not isinstance(config, dict):
+        return {"elements": [], "prefs": {}, "order": []}, ["config is not an object"]
+
+    # Elements keep the file's own labels, since the browser stores and
+    # saves them back; their normalized, deduplicated form ships as "terms"
+    elements = []
+    terms_by_id = {}
+    seen_ids = set()
+    raw_elements = config.get("elements", [])
+    if not isinstance(raw_elements, list):
+        warnings.append("'elements' is not a list")
+        raw_elements = []
+    for position, element in enumerate(raw_elements):
+        if not isinstance(element, dict):
+            warnings.append(f"element #{position} is not an object")
+            continue
+        element_id = element.get("id")
+        if not isinstance(element_id, str) or not element_id:
+            warnings.append(f"element #{position} has no id")
+            continue
+        if element_id in seen_ids:
+            warnings.append(f"duplicate id '{element_id}' ignored")
+            continue
+        seen_ids.add(element_id)
+
+        compiled = dict(element)
+        compiled["name"] = str(element.get("name") or element_id)
+        compiled.pop("terms", None)
+        if "labels" in element:
+            labels = element["labels"]
+            if not isinstance(labels, (str, list)):
+                warnings.append(f"'{element_id}': labels must be a string or a list")
+                labels = []
+            kept = []
+            terms = []
+            for label in [labels] if isinstance(labels, str) else labels:
+                term = normalize_label(label) if isinstance(label, str) else ""
+                if not term:
+                    warnings.append(f"'{element_id}': ignored label {json.dumps(label)}, labels must be non-empty strings")
+                elif term not in terms:
+                    kept.append(label)
+                    terms.append(term)
+            if terms:
+                compiled["labels"] = labels if isinstance(labels, str) else kept
+                compiled["terms"] = terms
+                terms_by_id[element_id] = terms
+            else:
+                del compiled["labels"]
+        if "componentId" in element and (not isinstance(element["componentId"], str) or not element["componentId"]):
+            warnings.append(f"'{element_id}': componentId must be a non-empty string")
+            del compiled["componentId"]
+        if "fingerprint" in element and not isinstance(element["fingerprint"], dict):
+            warnings.append(f"'{element_id}': fingerprint must be an object")
+            del compiled["fingerprint"]
+        if "labels" not in compiled and "componentId" not in compiled and "fingerprint" not in compiled:
+            warnings.append(f"'{element_id}' has no labels, componentId or fingerprint and matches nothing")
+        if "match" in element and element["match"] not in ("label", "text"):
+            warnings.append(f"'{element_id}': unknown match mode '{element['match']}'")
+            del compiled["match"]
+        if "default" in element and not isinstance(element["default"], bool):
+            warnings.append(f"'{element_id}': default must be true or false")
+            del compiled["default"]
+        elements.append(compiled)
+
+    # A term inside another element's term makes that element match too
+    owners = {}
+    for element_id, terms in terms_by_id.items():
+        for term in terms:
+            owners.setdefault(term, set()).add(element_id)
+    for term, ids in owners.items():
+        for other, other_ids in owners.items():
+            if term != other and term in other and other_ids - ids:
+                warnings.append(f"label '{term}' ({', '.join(sorted(ids))}) also matches "
+                                f"'{other}' ({', '.join(sorted(other_ids - ids))})")
+
+    prefs = config.get("prefs", {})
+    if not isinstance(prefs, dict):
+        warnings.append("'prefs' is not an object")
+        prefs = {}
+    for key, value in prefs.items():
+        if key in seen_ids and not isinstance(value, bool):
+            warnings.append(f"prefs: '{key}' must be true or false")
+    prefs = {key: value for key, value in prefs.items() if key in seen_ids and isinstance(value, bool)}
+
+    order = config.get("order", [])
+    if not isinstance(order, list):
+        warnings.append("'order' is not a list")
+        order = []
+    if not all(isinstance(item, str) for item in order):
+        warnings.append("'order' must only list element ids")
+    order = list(dict.fromkeys(item for item in order if isinstance(item, str) and item in seen_ids))
+
+    # Profiles list only the states they change and are stored that way.
+    # Full snapshots go out separately, so the browser can diff them
+    # against the live state directly.
+    profiles = {}
+    snapshots = {}
+    raw_profiles = config.get("profiles", {})
+    if not isinstance(raw_profiles, dict):
+        warnings.append("'profiles' is not an object")
+        raw_profiles = {}
+    for name, states in raw_profiles.items():
+        if not isinstance(states, dict):
+            warnings.append(f"profile '{name}' is not an object")
+            continue
+        for key, value in states.items():
+            if key not in seen_ids:
+                warnings.append(f"profile '{name}': unknown element '{key}'")
+            elif not isinstance(value, bool):
+                warnings.append(f"profile '{name}': '{key}' must be true or false")
+        profiles[name] = {key: value for key, value in states.items() if key in seen_ids and isinstance(value, bool)}
+        snapshots[name] = {
+            element["id"]: profiles[name].get(element["id"], element.get("default", True))
+            for element in elements
+        }
+
+    compiled_config = dict(config)
+    compiled_config.update({
+        "elements": elements, "prefs": prefs, "order": order,
+        "profiles": profiles, "profileSnapshots": snapshots
+    })
+    return compiled_config, warnings
+
+
+def critical_css(config):
+    """Pre-paint stylesheet for the save bridge and initially hidden elements with a stable id"""
+    selectors = [f"#{SAVE_BRIDGE_ID}"]
+    prefs = config.get("prefs", {})
+    for element in config["elements"]:
+        # Saved prefs win over the default, as they do in the browser
+        if prefs.get(element["id"], element.get("default", True)):
+            continue
+        # Label targets need the browser script to find them
+        fingerprint = element.get("fingerprint") or {}
+        element_id = fingerprint.get("elemId") or element.get("componentId")
+        if not isinstance(element_id, str) or POSITIONAL_ID.fullmatch(element_id):
+            continue
+        if CSS_ID.fullmatch(element_id):
+            selectors.append(f"#{element_id}")
+    return f"{', '.join(selectors)} {{ display: none !important; }}"
+
+
+def config_hash(config):
+    """Content hash of the parts of the config the browser keeps in localStorage"""
+    synced = {key: config.get(key) for key in ("elements", "prefs", "order", "profiles")}
+    return hashlib.sha256(json.dumps(synced, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()[:16]
+
+
+def compile_label_matcher(elements):
+    """Compile every element's labels into a serializable Aho-Corasick automaton"""
+    patterns = []
+    targets = []
+    pattern_ids = {}
+    for element in elements:
+        # compile_config() has already normalized and deduplicated these
+        for term in element.get("terms", []):
+            if term not in pattern_ids:
+                pattern_ids[term] = len(patterns)
+                patterns.append(term)
+                targets.append([])
+            if element.get("id") not in targets[pattern_ids[term]]:
+                targets[pattern_ids[term]].append(element.get("id"))
+
+    # Trie of all patterns
+    goto = [{}]
+    out = [[]]
+    for index, term in enumerate(patterns):
+        state = 0
+        for char in term:
+            if char not in goto[state]:
+                goto[state][char] = len(goto)
+                goto.append({})
+                out.append([])
+            state = goto[state][char]
+        out[state].append(index)
+
+    # Failure links, breadth first; outputs inherit along the fail chain
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for char, next_state in goto[state].items():
+            queue.append(next_state)
+            fallback = fail[state]
+            while fallback and char not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[next_state] = goto[fallback].get(char, 0)
+            out[next_state] = out[next_state] + out[fail[next_state]]
+
+    return {"patterns": patterns, "targets": targets, "goto": goto, "fail": fail, "out": out}
+
 class MobileTogglePlugin(WAN2GPPlugin):
     def __init__(self):
         super().__init__()
         self.name = PlugIn_Name
         self.version = "3.2"
         self.description = "Floating menu. Safe blank-space removal using State Tags."
+        self._config_key = None
+        self._config = None
+        self._js_payload = None
+        self._js_bundle_url = None
+        self._bundle = None
+        self._save_lock = threading.Lock()
+        self._save_timer = None
+        self._pending_save = None
+        self._last_save = 0.0
+
+    def config_path(self):
+        return os.path.join(os.path.dirname(__file__), 'config.json')
+
+    def config_key(self):
+        """Return (mtime_ns, size) of config.json, or None if it is missing"""
+        try:
+            stat = os.stat(self.config_path())
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
 
     def load_config(self):
-        """Load configuration from config.json if it exists"""
-        config_path = os.path.join(os.path.dirname(__file__), 'config.json')
-        if os.path.exists(config_path):
+        """Load configuration from config.json, reusing the parsed copy while the file is unchanged"""
+        key = self.config_key()
+        if self._config is not None and key == self._config_key:
+            return self._config
+        config = {"elements": [], "prefs": {}, "order": []}
+        if key is not None:
             try:
-                with open(config_path, 'r') as f:
-                    return json.load(f)
+                with open(self.config_path(), 'r', encoding='utf-8') as f:
+                    config = json.load(f)
             except Exception as e:
                 print(f"Error loading config.json: {e}")
-                return {"elements": [], "prefs": {}, "order": []}
-        return {"elements": [], "prefs": {}, "order": []}
-
-    def save_config(self, elements, prefs, order):
-        """Save configuration to config.json"""
-        config_path = os.path.join(os.path.dirname(__file__), 'config.json')
-        config_data = {
+        self._config_key = key
+        self._config = config
+        self._js_payload = None
+        return config
+
+    def save_config(self, elements, prefs, order, profiles=None):
+        """Save configuration to config.json through a temp file so a crash never truncates it"""
+        config_path = self.config_path()
+        config_data = dict(self.load_config())
+        config_data.update({
             "elements": elements,
             "prefs": prefs,
             "order": order
-        }
+        })
+        if profiles is not None:
+            config_data["profiles"] = profiles
+        tmp_path = None
         try:
-            with open(config_path, 'w') as f:
-                json.dump(config_data, f, indent=2)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(config_path), prefix='.config.', suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                # Same layout as the shipped file, names left readable
+                json.dump(config_data, f, indent=4, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates the file as 0600; keep config.json's own mode
+            if os.path.exists(config_path):
+                shutil.copymode(config_path, tmp_path)
+            os.replace(tmp_path, config_path)
+            self._config = None
+            self._js_payload = None
             return {"status": "success"}
         except Exception as e:
             print(f"Error saving config.json: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
             return {"status": "error", "message": str(e)}
 
+    def queue_config_save(self, payload):
+        """Coalesce saves sent by the browser into at most one write per SAVE_INTERVAL"""
+        try:
+            data = json.loads(payload)
+        except (TypeError, ValueError) as e:
+            print(f"Error reading config from browser: {e}")
+            return
+        if not isinstance(data, dict) or not isinstance(data.get("elements"), list):
+            print("Error reading config from browser: missing elements list")
+            return
+        with self._save_lock:
+            self._pending_save = data
+            if self._save_timer is None:
+                delay = max(0.0, self._last_save + SAVE_INTERVAL - time.monotonic())
+                self._save_timer = threading.Timer(delay, self.flush_config_save)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush_config_save(self):
+        """Write the latest queued config, if any"""
+        with self._save_lock:
+            data = self._pending_save
+            self._pending_save = None
+            self._save_timer = None
+            if data is None:
+                return
+            self._last_save = time.monotonic()
+            self.save_config(data["elements"], data.get("prefs", {}), data.get("order", []), data.get("profiles"))
+
+    def create_save_bridge(self):
+        """Hidden textbox and button the browser uses to send edits to the plugin"""
+        with gr.Column(elem_id=SAVE_BRIDGE_ID) as bridge:
+            payload = gr.Textbox(elem_id="hideui-save-payload", show_label=False, container=False)
+            save_btn = gr.Button("Save", elem_id="hideui-save-button")
+        save_btn.click(fn=self.queue_config_save, inputs=[payload], outputs=[], queue=False, show_progress="hidden")
+        return bridge
+
+    def load_bundle(self):
+        """Return (source, content hash) of static/hideui.js, read once per process"""
+        if self._bundle is None:
+            with open(BUNDLE_PATH, 'r', encoding='utf-8') as f:
+                source = f.read()
+            self._bundle = (source, hashlib.sha256(source.encode('utf-8')).hexdigest()[:16])
+        return self._bundle
+
+    def bundle_url(self):
+        """Expose static/ to Gradio and return the versioned bundle URL, or None if unsupported"""
+        if not hasattr(gr, "set_static_paths"):
+            return None
+        try:
+            gr.set_static_paths(paths=[STATIC_DIR])
+        except Exception as e:
+            print(f"Error registering static path: {e}")
+            return None
+        major = int(str(getattr(gr, "__version__", "5")).split(".")[0] or 5)
+        route = "gradio_api/file=" if major >= 5 else "file="
+        # Forward slashes and escaping keep Windows drive paths, spaces, '#' and '?' intact
+        path = urllib.parse.quote(pathlib.Path(BUNDLE_PATH).as_posix())
+        return f"{route}{path}?v={self.load_bundle()[1]}"
+
     def setup_ui(self):
-        self.add_custom_js(self.inject_floating_buttons_js())
+        self.add_custom_js(self.inject_floating_buttons_js(self.bundle_url()))
+        self.insert_after(SAVE_BRIDGE_ANCHOR, self.create_save_bridge)
 
 
-    def inject_floating_buttons_js(self) -> str:
-        # Load config from file
+    def inject_floating_buttons_js(self, bundle_url=None) -> str:
+        # Load config from file; the finished payload is reused until it changes
         config = self.load_config()
-        config_json = json.dumps(config)
-        
-        js_code = r"""
-        (function(){
-            const STORAGE_KEY_CUSTOM = "wan2gp_hideui_custom";
-            const STORAGE_KEY_PREFS = "wan2gp_hideui_prefs";
-            const STORAGE_KEY_ORDER = "wan2gp_hideui_order";
-            
-            // Load config from Python (injected from config.json)
-            const FILE_CONFIG = __CONFIG_JSON_PLACEHOLDER__;
-            
-            // ALWAYS load from file - file is source of truth
-            localStorage.setItem(STORAGE_KEY_CUSTOM, JSON.stringify(FILE_CONFIG.elements || []));
-            localStorage.setItem(STORAGE_KEY_PREFS, JSON.stringify(FILE_CONFIG.prefs || {}));
-            localStorage.setItem(STORAGE_KEY_ORDER, JSON.stringify(FILE_CONFIG.order || []));
-            
-            console.log("WAN2GP HideUI: Loaded config from file", FILE_CONFIG);
-
-            let pickerMode = false;
-            let highlightOverlay = null;
-            let allTargets = [];
-            let originalConfig = FILE_CONFIG; // Track original for modification detection
-            let editMode = localStorage.getItem('wan2gp_hideui_editMode') === 'true'; // Persist edit mode
-
-            // --- STORAGE LOGIC ---
-
-            function loadCustomElements() {
-                try {
-                    const saved = localStorage.getItem(STORAGE_KEY_CUSTOM);
-                    return saved ? JSON.parse(saved) : [];
-                } catch (e) {
-                    console.warn("Failed to load custom elements:", e);
-                    return [];
-                }
-            }
-
-            function saveCustomElements(elements) {
-                try {
-                    localStorage.setItem(STORAGE_KEY_CUSTOM, JSON.stringify(elements));
-                } catch (e) {
-                    console.error("Failed to save custom elements:", e);
-                }
-            }
-
-            function loadPreferences() {
-                try {
-                    const saved = localStorage.getItem(STORAGE_KEY_PREFS);
-                    return saved ? JSON.parse(saved) : {};
-                } catch (e) {
-                    console.warn("Failed to load preferences:", e);
-                    return {};
-                }
-            }
-
-            function savePreferences() {
-                const prefs = {};
-                allTargets.forEach(target => {
-                    const cb = document.getElementById(`cb-${target.id}`);
-                    if (cb) {
-                        prefs[target.id] = cb.checked;
-                    }
-                });
-                try {
-                    localStorage.setItem(STORAGE_KEY_PREFS, JSON.stringify(prefs));
-                } catch (e) {
-                    console.error("Failed to save preferences:", e);
-                }
-            }
-
-            function loadElementOrder() {
-                try {
-                    const saved = localStorage.getItem(STORAGE_KEY_ORDER);
-                    return saved ? JSON.parse(saved) : [];
-                } catch (e) {
-                    console.warn("Failed to load element order:", e);
-                    return [];
-                }
-            }
-
-            function saveElementOrder() {
-                try {
-                    const order = allTargets.map(t => t.id);
-                    localStorage.setItem(STORAGE_KEY_ORDER, JSON.stringify(order));
-                } catch (e) {
-                    console.error("Failed to save element order:", e);
-                }
-            }
-
-            // --- SAFETY LOGIC ---
-
-            function safeHide(element) {
-                element.style.display = "none";
-                let current = element.parentElement;
-                let safetyCounter = 0;
-
-                while (current && safetyCounter < 5) {
-                    if (current.tagName === "BODY" || current.classList.contains("gradio-container") || current.id === "root") break;
-
-                    const children = Array.from(current.children).filter(c => 
-                        ["DIV", "BUTTON", "SPAN", "INPUT", "LABEL", "FORM", "FIELDSET"].includes(c.tagName)
-                    );
-
-                    const allHidden = children.every(c => c.style.display === "none");
-
-                    if (allHidden && children.length > 0) {
-                        current.dataset.pluginHidden = "true"; 
-                        current.style.display = "none";
-                        current = current.parentElement;
-                        safetyCounter++;
-                    } else {
-                        break;
-                    }
-                }
-            }
-
-            function safeShow(element) {
-                element.style.display = "";
-                let current = element.parentElement;
-                let safetyCounter = 0;
-
-                while (current && safetyCounter < 5) {
-                    if (current.tagName === "BODY") break;
-
-                    if (current.dataset.pluginHidden === "true") {
-                        current.style.display = ""; 
-                        delete current.dataset.pluginHidden;
-                        current = current.parentElement;
-                        safetyCounter++;
-                    } else {
-                        break;
-                    }
-                }
-            }
-
-            // --- VISIBILITY LOGIC ---
-
-            function setVisibilityByLabels(searchLabels, shouldShow) {
-                const terms = Array.isArray(searchLabels) ? searchLabels : [searchLabels];
-                const allElements = Array.from(document.querySelectorAll("div[id^='component-'], button[id^='component-']"));
-
-                terms.forEach(term => {
-                    const lbl = term.toLowerCase().trim();
-                    const candidates = allElements.filter(el => {
-                        const text = (el.innerText || el.textContent || "").replace(/\s+/g,' ').trim().toLowerCase();
-                        return text.includes(lbl);
-                    });
-
-                    const targets = candidates.filter(el => {
-                        const containsChildMatch = candidates.some(other => other !== el && el.contains(other));
-                        return !containsChildMatch;
-                    });
-
-                    targets.forEach(el => {
-                        if (shouldShow) {
-                            safeShow(el);
-                        } else {
-                            safeHide(el);
-                        }
-                    });
-                });
-            }
-
-            function setVisibilityByElement(element, shouldShow) {
-                if (shouldShow) {
-                    safeShow(element);
-                } else {
-                    safeHide(element);
-                }
-            }
-
-            function setVisibilityByComponentId(componentId, shouldShow) {
-                const element = document.getElementById(componentId);
-                if (element) {
-                    setVisibilityByElement(element, shouldShow);
-                }
-            }
-
-            // --- ELEMENT PICKER ---
-
-            function createHighlightOverlay() {
-                const overlay = document.createElement("div");
-                overlay.id = "wan2gp-picker-overlay";
-                Object.assign(overlay.style, {
-                    position: "absolute",
-                    pointerEvents: "none",
-                    border: "3px solid #0284c7",
-                    background: "rgba(2, 132, 199, 0.1)",
-                    zIndex: "999998",
-                    display: "none",
-                    transition: "all 0.1s ease"
-                });
-                document.body.appendChild(overlay);
-                return overlay;
-            }
-
-            function enterPickerMode() {
-                pickerMode = true;
-                document.body.style.cursor = "crosshair";
-                
-                if (!highlightOverlay) {
-                    highlightOverlay = createHighlightOverlay();
-                }
-
-                // Update button text
-                const addBtn = document.getElementById("wan2gp-add-element-btn");
-                if (addBtn) {
-                    addBtn.textContent = "❌ Cancel";
-                    addBtn.style.background = "#dc2626";
-                }
-
-                // Add status message
-                let statusMsg = document.getElementById("wan2gp-picker-status");
-                if (!statusMsg) {
-                    statusMsg = document.createElement("div");
-                    statusMsg.id = "wan2gp-picker-status";
-                    Object.assign(statusMsg.style, {
-                        fontSize: "12px",
-                        color: "#60a5fa",
-                        padding: "8px",
-                        borderTop: "1px solid #555",
-                        marginTop: "8px",
-                        textAlign: "center"
-                    });
-                    statusMsg.textContent = "Click any element to add it...";
-                    document.getElementById("floating-menu").appendChild(statusMsg);
-                }
-
-                document.addEventListener("mouseover", highlightElement);
-                document.addEventListener("click", selectElement, true);
-            }
-
-            function exitPickerMode() {
-                pickerMode = false;
-                document.body.style.cursor = "";
-                
-                if (highlightOverlay) {
-                    highlightOverlay.style.display = "none";
-                }
-
-                const addBtn = document.getElementById("wan2gp-add-element-btn");
-                if (addBtn) {
-                    addBtn.textContent = "➕ Add Element";
-                    addBtn.style.background = "#16a34a";
-                }
-
-                const statusMsg = document.getElementById("wan2gp-picker-status");
-                if (statusMsg) {
-                    statusMsg.remove();
-                }
-
-                document.removeEventListener("mouseover", highlightElement);
-                document.removeEventListener("click", selectElement, true);
-            }
-
-            function highlightElement(e) {
-                if (!pickerMode) return;
-                
-                const target = e.target;
-                
-                // Skip our own UI
-                if (target.closest("#floating-toggle-container")) return;
-                
-                // Find the closest component
-                const component = target.closest("div[id^='component-']");
-                if (!component) return;
-
-                const rect = component.getBoundingClientRect();
-                Object.assign(highlightOverlay.style, {
-                    display: "block",
-                    left: rect.left + window.scrollX + "px",
-                    top: rect.top + window.scrollY + "px",
-                    width: rect.width + "px",
-                    height: rect.height + "px"
-                });
-            }
-
-            function selectElement(e) {
-                if (!pickerMode) return;
-                
-                e.preventDefault();
-                e.stopPropagation();
-                
-                const target = e.target;
-                
-                // Skip our own UI
-                if (target.closest("#floating-toggle-container")) return;
-                
-                const component = target.closest("div[id^='component-']");
-                if (!component) return;
-
-                // Get element info
-                const componentId = component.id;
-                const label = component.querySelector("label, span[data-testid='block-label']");
-                let elementName = label ? label.textContent.trim() : "";
-                
-                if (!elementName) {
-                    // Try to get any text
-                    const firstText = component.querySelector("span, p, h1, h2, h3");
-                    elementName = firstText ? firstText.textContent.trim().substring(0, 50) : `Component ${componentId}`;
-                }
-
-                // Prompt for custom name
-                const customName = prompt("Enter a name for this element:", elementName);
-                if (!customName) {
-                    exitPickerMode();
-                    return;
-                }
-
-                // Create custom element
-                const customId = "custom_" + customName.toLowerCase().replace(/[^a-z0-9]/g, '_');
-                const customElement = {
-                    id: customId,
-                    name: customName,
-                    componentId: componentId,
-                    isCustom: true,
-                    default: true  // New custom elements start visible by default
-                };
-
-                // Save to storage
-                const customElements = loadCustomElements();
-                customElements.push(customElement);
-                saveCustomElements(customElements);
-
-                // Exit picker mode and refresh UI
-                exitPickerMode();
-                buildMenuContent(); // Rebuild menu content
-            }
-
-            // --- UI CREATION ---
-
-            function createUI() {
-                // Remove existing UI if present
-                const existing = document.getElementById("floating-toggle-container");
-                if (existing) existing.remove();
-
-                // Load all elements from storage
-                allTargets = loadCustomElements();
-                
-                // Apply saved order
-                const savedOrder = loadElementOrder();
-                if (savedOrder.length > 0) {
-                    allTargets.sort((a, b) => {
-                        const aIndex = savedOrder.indexOf(a.id);
-                        const bIndex = savedOrder.indexOf(b.id);
-                        if (aIndex === -1 && bIndex === -1) return 0;
-                        if (aIndex === -1) return 1;
-                        if (bIndex === -1) return -1;
-                        return aIndex - bIndex;
-                    });
-                }
-
-                // Load saved preferences
-                const savedPrefs = loadPreferences();
-
-                const container = document.createElement("div");
-                container.id = "floating-toggle-container";
-                Object.assign(container.style, {
-                    position: "fixed", bottom: "16px", right: "16px", zIndex: "999999",
-                    display: "flex", flexDirection: "column", alignItems: "flex-end", gap: "10px"
-                });
-
-                const menu = document.createElement("div");
-                menu.id = "floating-menu";
-                Object.assign(menu.style, {
-                    background: "rgba(30, 30, 30, 0.95)", border: "1px solid #444", borderRadius: "8px",
-                    padding: "10px", display: "none", flexDirection: "column", gap: "8px",
-                    minWidth: "220px", boxShadow: "0 4px 12px rgba(0,0,0,0.5)", color: "white",
-                    maxHeight: "70vh", overflowY: "auto"
-                });
-                
-                // Prevent clicks inside menu from bubbling up and closing it
-                menu.onclick = (e) => e.stopPropagation();
-                
-                // Store global reference for buildMenuContent
-                menuElement = menu;
-
-                const createCheckbox = (target, index, onChange, isChecked=true, editMode=false) => {
-                    // Check if element has been modified
-                    const isModified = () => {
-                        const originalElement = originalConfig.elements?.find(e => e.id === target.id);
-                        if (!originalElement) return true; // New element
-                        return originalElement.name !== target.name; // Renamed
-                    };
-                    
-                    const wrapper = document.createElement("div");
-                    wrapper.draggable = editMode; // Only draggable in edit mode
-                    Object.assign(wrapper.style, {
-                        display: "flex",
-                        alignItems: "center",
-                        gap: "6px",
-                        padding: editMode ? "6px 4px" : "2px 4px",
-                        background: editMode ? "#2a2f3a" : "transparent",
-                        borderRadius: "4px",
-                        marginBottom: editMode ? "4px" : "2px",
-                        cursor: editMode ? "move" : "default"
-                    });
-                    
-                    // Drag and drop (only in edit mode)
-                    if (editMode) {
-                        wrapper.ondragstart = (e) => {
-                            e.dataTransfer.effectAllowed = "move";
-                            e.dataTransfer.setData("text/plain", index.toString());
-                            wrapper.style.opacity = "0.5";
-                        };
-                        wrapper.ondragend = (e) => {
-                            wrapper.style.opacity = "1";
-                        };
-                        wrapper.ondragover = (e) => {
-                            e.preventDefault();
-                            e.dataTransfer.dropEffect = "move";
-                            wrapper.style.borderTop = "2px solid #60a5fa";
-                        };
-                        wrapper.ondragleave = (e) => {
-                            wrapper.style.borderTop = "none";
-                        };
-                        wrapper.ondrop = (e) => {
-                            e.preventDefault();
-                            wrapper.style.borderTop = "none";
-                            const fromIndex = parseInt(e.dataTransfer.getData("text/plain"));
-                            const toIndex = index;
-                            if (fromIndex !== toIndex) {
-                                const movedElement = allTargets[fromIndex];
-                                allTargets.splice(fromIndex, 1);
-                                allTargets.splice(toIndex, 0, movedElement);
-                                saveElementOrder();
-                                createUI();
-                            }
-                        };
-                        
-                        // Drag handle (only in edit mode)
-                        const dragHandle = document.createElement("div");
-                        dragHandle.textContent = "≡";
-                        Object.assign(dragHandle.style, {
-                            color: "#9ca3af",
-                            fontSize: "16px",
-                            cursor: "grab",
-                            padding: "0 4px"
-                        });
-                        wrapper.appendChild(dragHandle);
-                    }
-                    
-                    // Checkbox
-                    const checkbox = document.createElement("input");
-                    checkbox.type = "checkbox";
-                    checkbox.id = `cb-${target.id}`;
-                    checkbox.checked = isChecked;
-                    checkbox.style.cursor = "pointer";
-                    checkbox.onclick = (e) => e.stopPropagation();
-                    checkbox.onchange = (e) => {
-                        onChange(e.target.checked);
-                        savePreferences();
-                    };
-                    wrapper.appendChild(checkbox);
-                    
-                    // Name
-                    const nameSpan = document.createElement("span");
-                    nameSpan.textContent = target.name;
-                    Object.assign(nameSpan.style, {
-                        flex: "1",
-                        fontSize: "13px",
-                        overflow: "hidden",
-                        textOverflow: "ellipsis",
-                        whiteSpace: "nowrap",
-                        cursor: editMode ? "move" : "default"
-                    });
-                    wrapper.appendChild(nameSpan);
-                    
-                    // Cached badge (only in edit mode, before star for alignment)
-                    if (editMode && isModified()) {
-                        const badge = document.createElement("span");
-                        badge.textContent = "Cached";
-                        Object.assign(badge.style, {
-                            fontSize: "10px",
-                            background: "#eab308",
-                            color: "#000",
-                            padding: "2px 6px",
-                            borderRadius: "3px",
-                            fontWeight: "bold"
-                        });
-                        wrapper.appendChild(badge);
-                    }
-                    
-                    // Default state indicator (clickable in edit mode)
-                    const defaultBadge = document.createElement(editMode ? "button" : "span");
-                    const isDefault = target.default !== false; // Default to true if undefined
-                    
-                    if (editMode) {
-                        // In edit mode: clickable button showing filled/empty star
-                        defaultBadge.textContent = isDefault ? "⭐" : "☆";
-                        defaultBadge.title = isDefault ? "Starts visible (click to toggle)" : "Starts hidden (click to toggle)";
-                        Object.assign(defaultBadge.style, {
-                            background: "transparent",
-                            border: "none",
-                            color: isDefault ? "#fbbf24" : "#6b7280",
-                            cursor: "pointer",
-                            fontSize: "18px",
-                            padding: "4px"
-                        });
-                        defaultBadge.onclick = (e) => {
-                            e.stopPropagation();
-                            target.default = !isDefault;
-                            // Save to localStorage
-                            let allElements = loadCustomElements();
-                            const idx = allElements.findIndex(el => el.id === target.id);
-                            if (idx !== -1) {
-                                allElements[idx].default = target.default;
-                                saveCustomElements(allElements);
-                            }
-                            // Update just this row instead of recreating entire UI
-                            defaultBadge.textContent = target.default ? "⭐" : "☆";
-                            defaultBadge.title = target.default ? "Starts visible (click to toggle)" : "Starts hidden (click to toggle)";
-                            defaultBadge.style.color = target.default ? "#fbbf24" : "#6b7280";
-                        };
-                    } else {
-                        // In normal mode: only show star if default=true
-                        if (isDefault) {
-                            defaultBadge.textContent = "⭐";
-                            defaultBadge.title = "Starts visible by default";
-                            Object.assign(defaultBadge.style, {
-                                fontSize: "14px",
-                                color: "#fbbf24"
-                            });
-                        } else {
-                            // Don't show anything if not default in normal mode
-                            defaultBadge.style.display = "none";
-                        }
-                    }
-                    wrapper.appendChild(defaultBadge);
-                    
-                    // Edit and Delete buttons (only in edit mode)
-                    if (editMode) {
-                        // Edit button
-                        const editBtn = document.createElement("button");
-                        editBtn.textContent = "✏️";
-                        editBtn.title = "Rename";
-                        Object.assign(editBtn.style, {
-                            background: "transparent",
-                            border: "none",
-                            color: "#fbbf24",
-                            cursor: "pointer",
-                            fontSize: "14px",
-                            padding: "4px"
-                        });
-                        editBtn.onclick = (e) => {
-                            e.stopPropagation();
-                            const newName = prompt("Rename element:", target.name);
-                            if (newName && newName !== target.name) {
-                                target.name = newName;
-                                let allElements = loadCustomElements();
-                                const idx = allElements.findIndex(el => el.id === target.id);
-                                if (idx !== -1) {
-                                    allElements[idx].name = newName;
-                                    saveCustomElements(allElements);
-                                }
-                                createUI();
-                            }
-                        };
-                        wrapper.appendChild(editBtn);
-                        
-                        // Delete button (X)
-                        const deleteBtn = document.createElement("button");
-                        deleteBtn.textContent = "✕";
-                        deleteBtn.title = "Delete";
-                        Object.assign(deleteBtn.style, {
-                            background: "transparent",
-                            border: "none",
-                            color: "#ef4444",
-                            cursor: "pointer",
-                            fontSize: "18px",
-                            padding: "4px",
-                            fontWeight: "bold"
-                        });
-                        deleteBtn.onclick = (e) => {
-                            e.stopPropagation();
-                            if (confirm(`Delete "${target.name}"?`)) {
-                                let allElements = loadCustomElements();
-                                allElements = allElements.filter(el => el.id !== target.id);
-                                saveCustomElements(allElements);
-                                createUI();
-                            }
-                        };
-                        wrapper.appendChild(deleteBtn);
-                    }
-                    
-                    return { wrapper, checkbox };
-                };
-
-                // Header
-                const headerDiv = document.createElement("div");
-                Object.assign(headerDiv.style,{
-                    fontWeight: "bold",
-                    borderBottom: "1px solid #555",
-                    paddingBottom: "8px",
-                    marginBottom: "4px"
-                });
-                
-                if (editMode) {
-                    // Edit mode: element count and action buttons at top
-                    const countDiv = document.createElement("div");
-                    countDiv.style.fontSize = "12px";
-                    countDiv.style.opacity = "0.7";
-                    countDiv.style.marginBottom = "8px";
-                    countDiv.textContent = `${allTargets.length} elements`;
-                    headerDiv.appendChild(countDiv);
-                    
-                    // Add Element button
-                    const addBtn = document.createElement("button");
-                    addBtn.id = "wan2gp-add-element-btn";
-                    addBtn.textContent = "➕ Add New Element";
-                    Object.assign(addBtn.style, {
-                        width: "100%",
-                        padding: "6px 12px",
-                        fontSize: "12px",
-                        background: "#2563eb",  // Blue
-                        color: "white",
-                        border: "none",
-                        borderRadius: "4px",
-                        cursor: "pointer",
-                        marginBottom: "4px"
-                    });
-                    addBtn.onclick = (e) => {
-                        e.stopPropagation(); // Prevent menu from closing
-                        if (pickerMode) {
-                            exitPickerMode();
-                        } else {
-                            enterPickerMode();
-                        }
-                    };
-                    headerDiv.appendChild(addBtn);
-
-                    // Export and Reset buttons (side by side, grey)
-                    const exportResetContainer = document.createElement("div");
-                    Object.assign(exportResetContainer.style, {
-                        display: "flex",
-                        gap: "4px",
-                        marginBottom: "8px"
-                    });
-
-                    // Export button
-                    const exportBtn = document.createElement("button");
-                    exportBtn.textContent = "📤 Export";
-                    Object.assign(exportBtn.style, {
-                        flex: "1",
-                        padding: "6px 12px",
-                        fontSize: "12px",
-                        background: "#374151",
-                        color: "white",
-                        border: "none",
-                        borderRadius: "4px",
-                        cursor: "pointer"
-                    });
-                    exportBtn.onclick = (e) => {
-                        e.stopPropagation(); // Prevent menu from closing
-                        const config = {
-                            elements: loadCustomElements(),
-                            prefs: loadPreferences(),
-                            order: loadElementOrder()
-                        };
-                        const jsonStr = JSON.stringify(config, null, 2);
-                        
-                        // Create modal to show JSON
-                        const modal = document.createElement("div");
-                        Object.assign(modal.style, {
-                            position: "fixed",
-                            top: "50%",
-                            left: "50%",
-                            transform: "translate(-50%, -50%)",
-                            background: "#1f2937",
-                            padding: "20px",
-                            borderRadius: "8px",
-                            boxShadow: "0 4px 20px rgba(0,0,0,0.5)",
-                            zIndex: "10001",
-                            maxWidth: "600px",
-                            width: "90%"
-                        });
-                        
-                        const title = document.createElement("h3");
-                        title.textContent = "Export Configuration";
-                        title.style.marginTop = "0";
-                        title.style.color = "white";
-                        modal.appendChild(title);
-                        
-                        const instructions = document.createElement("p");
-                        instructions.textContent = "Copy this JSON and paste it into config.json, then click Reset.";
-                        instructions.style.color = "#9ca3af";
-                        instructions.style.fontSize = "13px";
-                        modal.appendChild(instructions);
-                        
-                        const textarea = document.createElement("textarea");
-                        textarea.value = jsonStr;
-                        textarea.readOnly = true;
-                        Object.assign(textarea.style, {
-                            width: "100%",
-                            height: "300px",
-                            fontFamily: "monospace",
-                            fontSize: "12px",
-                            padding: "10px",
-                            background: "#111827",
-                            color: "#f3f4f6",
-                            border: "1px solid #374151",
-                            borderRadius: "4px",
-                            resize: "vertical"
-                        });
-                        textarea.onclick = () => textarea.select();
-                        modal.appendChild(textarea);
-                        
-                        const btnContainer = document.createElement("div");
-                        Object.assign(btnContainer.style, {
-                            marginTop: "12px",
-                            display: "flex",
-                            gap: "8px"
-                        });
-                        
-                        const copyBtn = document.createElement("button");
-                        copyBtn.textContent = "📋 Copy";
-                        Object.assign(copyBtn.style, {
-                            flex: "1",
-                            padding: "8px",
-                            background: "#16a34a",
-                            color: "white",
-                            border: "none",
-                            borderRadius: "4px",
-                            cursor: "pointer"
-                        });
-                        copyBtn.onclick = () => {
-                            textarea.select();
-                            document.execCommand('copy');
-                            copyBtn.textContent = "✓ Copied!";
-                            setTimeout(() => copyBtn.textContent = "📋 Copy", 2000);
-                        };
-                        
-                        const closeBtn = document.createElement("button");
-                        closeBtn.textContent = "Close";
-                        Object.assign(closeBtn.style, {
-                            flex: "1",
-                            padding: "8px",
-                            background: "#6b7280",
-                            color: "white",
-                            border: "none",
-                            borderRadius: "4px",
-                            cursor: "pointer"
-                        });
-                        closeBtn.onclick = () => document.body.removeChild(modal);
-                        
-                        btnContainer.appendChild(copyBtn);
-                        btnContainer.appendChild(closeBtn);
-                        modal.appendChild(btnContainer);
-                        
-                        document.body.appendChild(modal);
-                        textarea.select();
-                    };
-                    exportResetContainer.appendChild(exportBtn);
-
-                    // Reset button
-                    const resetBtn = document.createElement("button");
-                    resetBtn.textContent = "🔄 Reset";
-                    Object.assign(resetBtn.style, {
-                        flex: "1",
-                        padding: "6px 12px",
-                        fontSize: "12px",
-                        background: "#374151",
-                        color: "white",
-                        border: "none",
-                        borderRadius: "4px",
-                        cursor: "pointer"
-                    });
-                    resetBtn.onclick = (e) => {
-                        e.stopPropagation(); // Prevent menu from closing
-                        if (confirm("Clear all localStorage changes and reload from config.json?\\n\\nMake sure you've saved your Export first!")) {
-                            localStorage.removeItem(STORAGE_KEY_CUSTOM);
-                            localStorage.removeItem(STORAGE_KEY_PREFS);
-                            localStorage.removeItem(STORAGE_KEY_ORDER);
-                            location.reload();
-                        }
-                    };
-                    exportResetContainer.appendChild(resetBtn);
-                    headerDiv.appendChild(exportResetContainer);
-                    
-                    // Finished Editing button
-                    const editToggleBtn = document.createElement("button");
-                    editToggleBtn.textContent = "✔️ Finished Editing";
-                    Object.assign(editToggleBtn.style, {
-                        width: "100%",
-                        padding: "6px 12px",
-                        fontSize: "12px",  // Same as other buttons
-                        background: "#16a34a",  // Green
-                        color: "white",
-                        border: "none",
-                        borderRadius: "4px",
-                        cursor: "pointer",
-                        marginBottom: "0",
-                        fontWeight: "bold"
-                    });
-                    editToggleBtn.onclick = (e) => {
-                        e.stopPropagation();
-                        localStorage.setItem('wan2gp_hideui_editMode', 'false');
-                        location.reload();  // Reload to rebuild UI in normal mode
-                    };
-                    headerDiv.appendChild(editToggleBtn);
-                } else {
-                    // Normal mode: Show Default button prominent, Edit button small and grey
-                    
-                    // Show Default button (large and colorful)
-                    const hideDefaultBtn = document.createElement("button");
-                    hideDefaultBtn.textContent = "Show Default";
-                    Object.assign(hideDefaultBtn.style, {
-                        width: "100%",
-                        padding: "10px 12px",
-                        fontSize: "14px",
-                        background: "#6366f1",
-                        color: "white",
-                        border: "none",
-                        borderRadius: "4px",
-                        cursor: "pointer",
-                        marginBottom: "8px",
-                        fontWeight: "bold"
-                    });
-                    hideDefaultBtn.onclick = (e) => {
-                        e.stopPropagation(); // Prevent menu from closing
-                        allTargets.forEach(target => {
-                            const cb = document.getElementById(`cb-${target.id}`);
-                            if(cb) {
-                                // Set to default state (true for starred, false for non-starred)
-                                const defaultState = target.default !== false; // Default to true if undefined
-                                cb.checked = defaultState;
-                                if (target.labels) {
-                                    setVisibilityByLabels(target.labels, defaultState);
-                                } else if (target.componentId) {
-                                    setVisibilityByComponentId(target.componentId, defaultState);
-                                }
-                            }
-                        });
-                        savePreferences();
-                    };
-                    headerDiv.appendChild(hideDefaultBtn);
-                    
-                    // Button container for Show/Hide All and Edit
-                    const btnContainer = document.createElement("div");
-                    Object.assign(btnContainer.style, {
-                        display: "flex",
-                        gap: "8px",
-                        marginTop: "0"
-                    });
-                    
-                    // Show/Hide All button (small grey)
-                    const toggleAllBtn = document.createElement("button");
-                    toggleAllBtn.textContent = "Show/Hide All";
-                    Object.assign(toggleAllBtn.style, {
-                        flex: "1",
-                        padding: "6px 12px",
-                        fontSize: "12px",
-                        background: "#374151",
-                        color: "white",
-                        border: "none",
-                        borderRadius: "4px",
-                        cursor: "pointer"
-                    });
-                    let allHidden = false;
-                    toggleAllBtn.onclick = (e) => {
-                        e.stopPropagation(); // Prevent menu from closing
-                        allHidden = !allHidden;
-                        allTargets.forEach(target => {
-                            const cb = document.getElementById(`cb-${target.id}`);
-                            if(cb) {
-                                cb.checked = !allHidden;
-                                if (target.labels) {
-                                    setVisibilityByLabels(target.labels, !allHidden);
-                                } else if (target.componentId) {
-                                    setVisibilityByComponentId(target.componentId, !allHidden);
-                                }
-                            }
-                        });
-                        savePreferences();
-                    };
-                    
-                    // Edit button (small grey)
-                    const editToggleBtn = document.createElement("button");
-                    editToggleBtn.textContent = "Edit";
-                    Object.assign(editToggleBtn.style, {
-                        flex: "1",
-                        padding: "6px 12px",
-                        fontSize: "12px",
-                        background: "#374151",
-                        color: "white",
-                        border: "none",
-                        borderRadius: "4px",
-                        cursor: "pointer"
-                    });
-                    editToggleBtn.onclick = (e) => {
-                        e.stopPropagation();
-                        localStorage.setItem('wan2gp_hideui_editMode', 'true');
-                        location.reload();  // Reload to rebuild UI in edit mode
-                    };
-                    
-                    btnContainer.appendChild(toggleAllBtn);
-                    btnContainer.appendChild(editToggleBtn);
-                    headerDiv.appendChild(btnContainer);
-                }
-
-                // Separator
-                const separator1 = document.createElement("div");
-                Object.assign(separator1.style, {
-                    borderTop: "1px solid #555",
-                    marginTop: "8px",
-                    marginBottom: "8px"
-                });
-                headerDiv.appendChild(separator1);
-
-                menu.appendChild(headerDiv);
-
-                // Element checkboxes with management buttons
-                allTargets.forEach((target, index) => {
-                    const initialStatus = savedPrefs.hasOwnProperty(target.id) 
-                        ? savedPrefs[target.id] 
-                        : (target.default !== undefined ? target.default : true);
-                    
-                    const row = createCheckbox(
-                        target,
-                        index,
-                        (checked) => {
-                            if (target.labels) {
-                                setVisibilityByLabels(target.labels, checked);
-                            } else if (target.componentId) {
-                                setVisibilityByComponentId(target.componentId, checked);
-                            }
-                        }, 
-                        initialStatus,
-                        editMode // Pass editMode parameter
-                    );
-                    
-                    menu.appendChild(row.wrapper);
-                    
-                    // Apply initial visibility
-                    if (target.labels) {
-                        setVisibilityByLabels(target.labels, initialStatus);
-                    } else if (target.componentId) {
-                        setVisibilityByComponentId(target.componentId, initialStatus);
-                    }
-                });
-
-                // Main toggle button
-                const mainBtn = document.createElement("button");
-                mainBtn.textContent = "☰ UI";
-                Object.assign(mainBtn.style, {
-                    padding: "10px 16px", borderRadius: "24px",
-                    background: "#0284c7", color: "white", border: "none", cursor: "pointer",
-                    boxShadow: "0 2px 8px rgba(0,0,0,0.4)", fontWeight: "bold"
-                });
-
-                mainBtn.onclick = () => {
-                    const isHidden = menu.style.display === "none";
-                    menu.style.display = isHidden ? "flex" : "none";
-                    mainBtn.textContent = isHidden ? "✕ Close" : "☰ UI";
-                    
-                    // Exit picker mode if menu is closed
-                    if (!isHidden && pickerMode) {
-                        exitPickerMode();
-                    }
-                };
-
-                container.appendChild(menu);
-                container.appendChild(mainBtn);
-                document.body.appendChild(container);
-                
-                // Build the menu content
-                buildMenuContent();
-
-                console.log(`WAN2GP HideUI: ${allTargets.length} elements loaded`);
-            }
-            
-            // Function to rebuild just the menu content (keeps menu open)
-            let menuElement = null; // Global reference to menu
-            
-            function buildMenuContent() {
-                if (!menuElement) return; // Menu not created yet
-                
-                // Clear existing content
-                menuElement.innerHTML = '';
-                
-                // Load all elements from storage
-                allTargets = loadCustomElements();
-                
-                // Apply saved order
-                const savedOrder = loadElementOrder();
-                if (savedOrder.length > 0) {
-                    allTargets.sort((a, b) => {
-                        const aIndex = savedOrder.indexOf(a.id);
-                        const bIndex = savedOrder.indexOf(b.id);
-                        if (aIndex === -1 && bIndex === -1) return 0;
-                        if (aIndex === -1) return 1;
-                        if (bIndex === -1) return -1;
-                        return aIndex - bIndex;
-                    });
-                }
-
-                // Load saved preferences
-                const savedPrefs = loadPreferences();
-
-                // Create checkbox function (same as before)
-                const createCheckbox = (target, index, onChange, isChecked=true, editMode=false) => {
-                    // Check if element has been modified
-                    const isModified = () => {
-                        const originalElement = originalConfig.elements?.find(e => e.id === target.id);
-                        if (!originalElement) return true; // New element
-                        return originalElement.name !== target.name; // Renamed
-                    };
-                    
-                    const wrapper = document.createElement("div");
-                    wrapper.draggable = editMode; // Only draggable in edit mode
-                    Object.assign(wrapper.style, {
-                        display: "flex",
-                        alignItems: "center",
-                        gap: "6px",
-                        padding: editMode ? "6px 4px" : "2px 4px",
-                        background: editMode ? "#2a2f3a" : "transparent",
-                        borderRadius: "4px",
-                        marginBottom: editMode ? "4px" : "2px",
-                        cursor: editMode ? "move" : "default"
-                    });
-                    
-                    // Drag and drop (only in edit mode)
-                    if (editMode) {
-                        wrapper.ondragstart = (e) => {
-                            e.dataTransfer.effectAllowed = "move";
-                            e.dataTransfer.setData("text/plain", index);
-                            wrapper.style.opacity = "0.5";
-                        };
-                        
-                        wrapper.ondragend = () => {
-                            wrapper.style.opacity = "1";
-                        };
-                        
-                        wrapper.ondragover = (e) => {
-                            e.preventDefault();
-                            e.dataTransfer.dropEffect = "move";
-                        };
-                        
-                        wrapper.ondrop = (e) => {
-                            e.preventDefault();
-                            const fromIndex = parseInt(e.dataTransfer.getData("text/plain"));
-                            const toIndex = index;
-                            
-                            if (fromIndex !== toIndex) {
-                                const item = allTargets.splice(fromIndex, 1)[0];
-                                allTargets.splice(toIndex, 0, item);
-                                saveCustomElements(allTargets);
-                                saveElementOrder();
-                                buildMenuContent(); // Rebuild menu content
-                            }
-                        };
-                        
-                        // Drag handle (only in edit mode)
-                        const dragHandle = document.createElement("span");
-                        dragHandle.textContent = "≡";
-                        Object.assign(dragHandle.style, {
-                            cursor: "move",
-                            color: "#888",
-                            fontSize: "16px",
-                            userSelect: "none"
-                        });
-                        wrapper.appendChild(dragHandle);
-                    }
-                    
-                    // Checkbox
-                    const checkbox = document.createElement("input");
-                    checkbox.type = "checkbox";
-                    checkbox.id = `cb-${target.id}`;
-                    checkbox.checked = isChecked;
-                    checkbox.onchange = () => {
-                        onChange(checkbox.checked);
-                        savePreferences();
-                    };
-                    Object.assign(checkbox.style, {
-                        cursor: "pointer",
-                        accentColor: "#0284c7"
-                    });
-                    wrapper.appendChild(checkbox);
-                    
-                    // Element name
-                    const nameSpan = document.createElement("span");
-                    nameSpan.textContent = target.name;
-                    Object.assign(nameSpan.style, {
-                        flex: "1",
-                        fontSize: "13px",
-                        cursor: "default"
-                    });
-                    wrapper.appendChild(nameSpan);
-                    
-                    // Cached badge (only in edit mode, before star for alignment)
-                    if (editMode && isModified()) {
-                        const badge = document.createElement("span");
-                        badge.textContent = "Cached";
-                        Object.assign(badge.style, {
-                            fontSize: "10px",
-                            background: "#eab308",
-                            color: "#000",
-                            padding: "2px 6px",
-                            borderRadius: "3px",
-                            fontWeight: "bold"
-                        });
-                        wrapper.appendChild(badge);
-                    }
-                    
-                    // Default state indicator (clickable in edit mode)
-                    const defaultBadge = document.createElement(editMode ? "button" : "span");
-                    const isDefault = target.default !== false; // Default to true if undefined
-                    
-                    if (editMode) {
-                        // In edit mode: clickable button showing filled/empty star
-                        defaultBadge.textContent = isDefault ? "⭐" : "☆";
-                        defaultBadge.title = isDefault ? "Starts visible (click to toggle)" : "Starts hidden (click to toggle)";
-                        Object.assign(defaultBadge.style, {
-                            background: "transparent",
-                            border: "none",
-                            color: isDefault ? "#fbbf24" : "#6b7280",
-                            cursor: "pointer",
-                            fontSize: "18px",
-                            padding: "4px"
-                        });
-                        defaultBadge.onclick = (e) => {
-                            e.stopPropagation();
-                            target.default = !isDefault;
-                            // Save to localStorage
-                            let allElements = loadCustomElements();
-                            const idx = allElements.findIndex(el => el.id === target.id);
-                            if (idx !== -1) {
-                                allElements[idx].default = target.default;
-                                saveCustomElements(allElements);
-                            }
-                            // Update just this row instead of recreating entire UI
-                            defaultBadge.textContent = target.default ? "⭐" : "☆";
-                            defaultBadge.title = target.default ? "Starts visible (click to toggle)" : "Starts hidden (click to toggle)";
-                            defaultBadge.style.color = target.default ? "#fbbf24" : "#6b7280";
-                        };
-                    } else {
-                        // In normal mode: only show star if default=true
-                        if (isDefault) {
-                            defaultBadge.textContent = "⭐";
-                            defaultBadge.title = "Starts visible by default";
-                            Object.assign(defaultBadge.style, {
-                                fontSize: "14px",
-                                color: "#fbbf24"
-                            });
-                        } else {
-                            // Don't show anything if not default in normal mode
-                            defaultBadge.style.display = "none";
-                        }
-                    }
-                    wrapper.appendChild(defaultBadge);
-                    
-                    // Edit and Delete buttons (only in edit mode)
-                    if (editMode) {
-                        const editBtn = document.createElement("button");
-                        editBtn.textContent = "✏️";
-                        editBtn.title = "Rename element";
-                        Object.assign(editBtn.style, {
-                            background: "transparent",
-                            border: "none",
-                            cursor: "pointer",
-                            fontSize: "14px",
-                            padding: "2px 4px"
-                        });
-                        editBtn.onclick = (e) => {
-                            e.stopPropagation();
-                            const newName = prompt(`Rename "${target.name}":`, target.name);
-                            if (newName && newName !== target.name) {
-                                target.name = newName;
-                                let allElements = loadCustomElements();
-                                const idx = allElements.findIndex(el => el.id === target.id);
-                                if (idx !== -1) {
-                                    allElements[idx].name = newName;
-                                    saveCustomElements(allElements);
-                                }
-                                buildMenuContent(); // Rebuild menu content
-                            }
-                        };
-                        wrapper.appendChild(editBtn);
-                        
-                        const deleteBtn = document.createElement("button");
-                        deleteBtn.textContent = "✕";
-                        deleteBtn.title = "Delete element";
-                        Object.assign(deleteBtn.style, {
-                            background: "transparent",
-                            border: "none",
-                            cursor: "pointer",
-                            fontSize: "14px",
-                            color: "#dc2626",
-                            padding: "2px 4px"
-                        });
-                        deleteBtn.onclick = (e) => {
-                            e.stopPropagation();
-                            if (confirm(`Delete "${target.name}"?`)) {
-                                let allElements = loadCustomElements();
-                                allElements = allElements.filter(el => el.id !== target.id);
-                                saveCustomElements(allElements);
-                                buildMenuContent(); // Rebuild menu content
-                            }
-                        };
-                        wrapper.appendChild(deleteBtn);
-                    }
-                    
-                    return { wrapper, checkbox };
-                };
-
-                // Build header
-                const headerDiv = document.createElement("div");
-                Object.assign(headerDiv.style,{
-                    fontWeight: "bold",
-                    borderBottom: "1px solid #555",
-                    paddingBottom: "8px",
-                    marginBottom: "4px"
-                });
-                
-                if (editMode) {
-                    // Edit mode: element count and action buttons at top
-                    const countDiv = document.createElement("div");
-                    countDiv.style.fontSize = "12px";
-                    countDiv.style.opacity = "0.7";
-                    countDiv.style.marginBottom = "8px";
-                    countDiv.textContent = `${allTargets.length} elements`;
-                    headerDiv.appendChild(countDiv);
-                    
-                    // Add Element button
-                    const addBtn = document.createElement("button");
-                    addBtn.id = "wan2gp-add-element-btn";
-                    addBtn.textContent = "➕ Add New Element";
-                    Object.assign(addBtn.style, {
-                        width: "100%",
-                        padding: "6px 12px",
-                        fontSize: "12px",
-                        background: "#2563eb",  // Blue
-                        color: "white",
-                        border: "none",
-                        borderRadius: "4px",
-                        cursor: "pointer",
-                        marginBottom: "4px"
-                    });
-                    addBtn.onclick = (e) => {
-                        e.stopPropagation(); // Prevent menu from closing
-                        if (pickerMode) {
-                            exitPickerMode();
-                        } else {
-                            enterPickerMode();
-                        }
-                    };
-                    headerDiv.appendChild(addBtn);
-
-                    // Export and Reset buttons (side by side, grey)
-                    const exportResetContainer = document.createElement("div");
-                    Object.assign(exportResetContainer.style, {
-                        display: "flex",
-                        gap: "4px",
-                        marginBottom: "8px"
-                    });
-
-                    // Export button
-                    const exportBtn = document.createElement("button");
-                    exportBtn.textContent = "📤 Export";
-                    Object.assign(exportBtn.style, {
-                        flex: "1",
-                        padding: "6px 12px",
-                        fontSize: "12px",
-                        background: "#374151",
-                        color: "white",
-                        border: "none",
-                        borderRadius: "4px",
-                        cursor: "pointer"
-                    });
-                    exportBtn.onclick = (e) => {
-                        e.stopPropagation(); // Prevent menu from closing
-                        const config = {
-                            elements: loadCustomElements(),
-                            prefs: loadPreferences(),
-                            order: loadElementOrder()
-                        };
-                        const jsonStr = JSON.stringify(config, null, 2);
-                        
-                        // Create modal to show JSON
-                        const modal = document.createElement("div");
-                        Object.assign(modal.style, {
-                            position: "fixed",
-                            top: "50%",
-                            left: "50%",
-                            transform: "translate(-50%, -50%)",
-                            background: "#1f2937",
-                            padding: "20px",
-                            borderRadius: "8px",
-                            boxShadow: "0 4px 20px rgba(0,0,0,0.5)",
-                            zIndex: "10001",
-                            maxWidth: "600px",
-                            width: "90%"
-                        });
-                        
-                        const title = document.createElement("h3");
-                        title.textContent = "Export Configuration";
-                        title.style.marginTop = "0";
-                        title.style.color = "white";
-                        modal.appendChild(title);
-                        
-                        const instructions = document.createElement("p");
-                        instructions.textContent = "Copy this JSON and paste it into config.json, then click Reset.";
-                        instructions.style.color = "#9ca3af";
-                        instructions.style.fontSize = "13px";
-                        modal.appendChild(instructions);
-                        
-                        const textarea = document.createElement("textarea");
-                        textarea.value = jsonStr;
-                        textarea.readOnly = true;
-                        Object.assign(textarea.style, {
-                            width: "100%",
-                            height: "300px",
-                            fontFamily: "monospace",
-                            fontSize: "12px",
-                            padding: "10px",
-                            background: "#111827",
-                            color: "#f3f4f6",
-                            border: "1px solid #374151",
-                            borderRadius: "4px",
-                            resize: "vertical"
-                        });
-                        textarea.onclick = () => textarea.select();
-                        modal.appendChild(textarea);
-                        
-                        const btnContainer = document.createElement("div");
-                        Object.assign(btnContainer.style, {
-                            marginTop: "12px",
-                            display: "flex",
-                            gap: "8px"
-                        });
-                        
-                        const copyBtn = document.createElement("button");
-                        copyBtn.textContent = "📋 Copy";
-                        Object.assign(copyBtn.style, {
-                            flex: "1",
-                            padding: "8px",
-                            background: "#16a34a",
-                            color: "white",
-                            border: "none",
-                            borderRadius: "4px",
-                            cursor: "pointer"
-                        });
-                        copyBtn.onclick = () => {
-                            textarea.select();
-                            document.execCommand('copy');
-                            copyBtn.textContent = "✓ Copied!";
-                            setTimeout(() => copyBtn.textContent = "📋 Copy", 2000);
-                        };
-                        
-                        const closeBtn = document.createElement("button");
-                        closeBtn.textContent = "Close";
-                        Object.assign(closeBtn.style, {
-                            flex: "1",
-                            padding: "8px",
-                            background: "#6b7280",
-                            color: "white",
-                            border: "none",
-                            borderRadius: "4px",
-                            cursor: "pointer"
-                        });
-                        closeBtn.onclick = () => document.body.removeChild(modal);
-                        
-                        btnContainer.appendChild(copyBtn);
-                        btnContainer.appendChild(closeBtn);
-                        modal.appendChild(btnContainer);
-                        
-                        document.body.appendChild(modal);
-                        textarea.select();
-                    };
-                    exportResetContainer.appendChild(exportBtn);
-
-                    // Reset button
-                    const resetBtn = document.createElement("button");
-                    resetBtn.textContent = "🗑️ Clear Cached";
-                    Object.assign(resetBtn.style, {
-                        flex: "1",
-                        padding: "6px 12px",
-                        fontSize: "12px",
-                        background: "#374151",
-                        color: "white",
-                        border: "none",
-                        borderRadius: "4px",
-                        cursor: "pointer"
-                    });
-                    resetBtn.onclick = (e) => {
-                        e.stopPropagation(); // Prevent menu from closing
-                        if (confirm("Clear all localStorage changes and reload from config.json?\\n\\nMake sure you've saved your Export first!")) {
-                            localStorage.removeItem(STORAGE_KEY_CUSTOM);
-                            localStorage.removeItem(STORAGE_KEY_PREFS);
-                            localStorage.removeItem(STORAGE_KEY_ORDER);
-                            location.reload();
-                        }
-                    };
-                    exportResetContainer.appendChild(resetBtn);
-                    headerDiv.appendChild(exportResetContainer);
-                    
-                    // Finished Editing button
-                    const editToggleBtn = document.createElement("button");
-                    editToggleBtn.textContent = "✔️ Finished Editing";
-                    Object.assign(editToggleBtn.style, {
-                        width: "100%",
-                        padding: "6px 12px",
-                        fontSize: "12px",  // Same as other buttons
-                        background: "#16a34a",  // Green
-                        color: "white",
-                        border: "none",
-                        borderRadius: "4px",
-                        cursor: "pointer",
-                        marginBottom: "0",
-                        fontWeight: "bold"
-                    });
-                    editToggleBtn.onclick = (e) => {
-                        e.stopPropagation();
-                        localStorage.setItem('wan2gp_hideui_editMode', 'false');
-                        editMode = false;
-                        buildMenuContent(); // Rebuild menu content without closing
-                    };
-                    headerDiv.appendChild(editToggleBtn);
-                } else {
-                    // Normal mode: Show Default button prominent, Edit button small and grey
-                    
-                    // Show Default button (large and colorful)
-                    const hideDefaultBtn = document.createElement("button");
-                    hideDefaultBtn.textContent = "Show Default";
-                    Object.assign(hideDefaultBtn.style, {
-                        width: "100%",
-                        padding: "10px 12px",
-                        fontSize: "14px",
-                        background: "#6366f1",
-                        color: "white",
-                        border: "none",
-                        borderRadius: "4px",
-                        cursor: "pointer",
-                        marginBottom: "8px",
-                        fontWeight: "bold"
-                    });
-                    hideDefaultBtn.onclick = (e) => {
-                        e.stopPropagation(); // Prevent menu from closing
-                        allTargets.forEach(target => {
-                            const cb = document.getElementById(`cb-${target.id}`);
-                            if(cb) {
-                                // Set to default state (true for starred, false for non-starred)
-                                const defaultState = target.default !== false; // Default to true if undefined
-                                cb.checked = defaultState;
-                                if (target.labels) {
-                                    setVisibilityByLabels(target.labels, defaultState);
-                                } else if (target.componentId) {
-                                    setVisibilityByComponentId(target.componentId, defaultState);
-                                }
-                            }
-                        });
-                        savePreferences();
-                    };
-                    headerDiv.appendChild(hideDefaultBtn);
-                    
-                    // Button container for Show/Hide All and Edit
-                    const btnContainer = document.createElement("div");
-                    Object.assign(btnContainer.style, {
-                        display: "flex",
-                        gap: "8px",
-                        marginTop: "0"
-                    });
-                    
-                    // Show/Hide All button (small grey)
-                    const toggleAllBtn = document.createElement("button");
-                    toggleAllBtn.textContent = "Show/Hide All";
-                    Object.assign(toggleAllBtn.style, {
-                        flex: "1",
-                        padding: "6px 12px",
-                        fontSize: "12px",
-                        background: "#374151",
-                        color: "white",
-                        border: "none",
-                        borderRadius: "4px",
-                        cursor: "pointer"
-                    });
-                    let allHidden = false;
-                    toggleAllBtn.onclick = (e) => {
-                        e.stopPropagation(); // Prevent menu from closing
-                        allHidden = !allHidden;
-                        allTargets.forEach(target => {
-                            const cb = document.getElementById(`cb-${target.id}`);
-                            if(cb) {
-                                cb.checked = !allHidden;
-                                if (target.labels) {
-                                    setVisibilityByLabels(target.labels, !allHidden);
-                                } else if (target.componentId) {
-                                    setVisibilityByComponentId(target.componentId, !allHidden);
-                                }
-                            }
-                        });
-                        savePreferences();
-                    };
-                    
-                    // Edit button (small grey)
-                    const editToggleBtn = document.createElement("button");
-                    editToggleBtn.textContent = "Edit";
-                    Object.assign(editToggleBtn.style, {
-                        flex: "1",
-                        padding: "6px 12px",
-                        fontSize: "12px",
-                        background: "#374151",
-                        color: "white",
-                        border: "none",
-                        borderRadius: "4px",
-                        cursor: "pointer"
-                    });
-                    editToggleBtn.onclick = (e) => {
-                        e.stopPropagation();
-                        localStorage.setItem('wan2gp_hideui_editMode', 'true');
-                        editMode = true;
-                        buildMenuContent(); // Rebuild menu content without closing
-                    };
-                    
-                    btnContainer.appendChild(toggleAllBtn);
-                    btnContainer.appendChild(editToggleBtn);
-                    headerDiv.appendChild(btnContainer);
-                }
-
-                // Separator
-                const separator1 = document.createElement("div");
-                Object.assign(separator1.style, {
-                    borderTop: "1px solid #555",
-                    marginTop: "8px",
-                    marginBottom: "8px"
-                });
-                headerDiv.appendChild(separator1);
-
-                menuElement.appendChild(headerDiv);
-
-                // Element checkboxes with management buttons
-                allTargets.forEach((target, index) => {
-                    const initialStatus = savedPrefs.hasOwnProperty(target.id) 
-                        ? savedPrefs[target.id] 
-                        : (target.default !== undefined ? target.default : true);
-                    
-                    const row = createCheckbox(
-                        target,
-                        index,
-                        (checked) => {
-                            if (target.labels) {
-                                setVisibilityByLabels(target.labels, checked);
-                            } else if (target.componentId) {
-                                setVisibilityByComponentId(target.componentId, checked);
-                            }
-                        }, 
-                        initialStatus,
-                        editMode // Pass editMode parameter
-                    );
-                    
-                    menuElement.appendChild(row.wrapper);
-                    
-                    // Apply initial visibility
-                    if (target.labels) {
-                        setVisibilityByLabels(target.labels, initialStatus);
-                    } else if (target.componentId) {
-                        setVisibilityByComponentId(target.componentId, initialStatus);
-                    }
-                });
-            }
-
-            function init() { createUI(); }
-
-            // Initialize on page load
-            window.addEventListener("gradioLoaded", () => setTimeout(init, 300));
-            document.addEventListener("DOMContentLoaded", () => setTimeout(init, 500));
-            window.addEventListener("load", () => setTimeout(init, 700));
-
-            let tries = 0;
-            const interval = setInterval(() => {
-                tries++;
-                init();
-                if (tries > 10) clearInterval(interval);
-            }, 800);
-            
-            setTimeout(init, 100);
-        })();
-        """
+        if self._js_payload is not None and self._js_bundle_url == bundle_url:
+            return self._js_payload
+        self._js_bundle_url = bundle_url
+        config, warnings = compile_config(config)
+        for warning in warnings:
+            print(f"Warning in config.json: {warning}")
+        config["hash"] = config_hash(config)
+        config["matcher"] = compile_label_matcher(config["elements"])
+        config_json = json.dumps(config, separators=(",", ":"))
         
-        return js_code.replace("__CONFIG_JSON_PLACEHOLDER__", config_json)
\ No newline at end of file
+        critical_blob = CRITICAL_STYLE_LOADER.replace("__CRITICAL_CSS__", json.dumps(critical_css(config)))
+        config_blob = critical_blob + f"window.__hideuiConfig = {config_json};\n"
+        if bundle_url is None:
+            # No static route: ship the bundle inline, as older versions did
+            self._js_payload = config_blob + self.load_bundle()[0]
+        else:
+            self._js_payload = config_blob + BUNDLE_LOADER.replace("__BUNDLE_URL__", json.dumps(bundle_url))
+        return self._js_payload
\ No newline at end of file
@@ -0,0 +1,2284 @@
+(function(){
+    const STORAGE_KEY_CUSTOM = "wan2gp_hideui_custom";
+    const STORAGE_KEY_PREFS = "wan2gp_hideui_prefs";
+    const STORAGE_KEY_ORDER = "wan2gp_hideui_order";
+    const STORAGE_KEY_PROFILES = "wan2gp_hideui_profiles";
+
+    // Load config from Python (compiled from config.json and set inline by the plugin)
+    const FILE_CONFIG = window.__hideuiConfig || { elements: [], prefs: {}, order: [] };
+
+    console.log("WAN2GP HideUI: Loaded config from file", FILE_CONFIG);
+
+    let pickerMode = false;
+    let highlightOverlay = null;
+    let allTargets = [];
+    let originalConfig = FILE_CONFIG; // Track original for modification detection
+    let editMode = localStorage.getItem('wan2gp_hideui_editMode') === 'true'; // Persist edit mode
+
+    // --- INSTRUMENTATION ---
+
+    // Hot paths are wrapped by timed() (see the end of the script). Only
+    // top-level calls are kept as spans, so a long task reported by the
+    // browser can be attributed to whatever plugin work overlapped it.
+    const MAX_SPANS = 200;
+    const stats = {
+        calls: {}, // name -> { count, totalMs, maxMs }
+        nodesScanned: 0,
+        innerTextReads: 0,
+        longTasks: { count: 0, totalMs: 0, hideui: 0, hideuiMs: 0, byCall: {} }
+    };
+    window.__hideuiStats = stats;
+    const recentSpans = [];
+    let timedDepth = 0;
+
+    function timed(name, fn) {
+        return function (...args) {
+            const start = performance.now();
+            timedDepth++;
+            try {
+                return fn.apply(this, args);
+            } finally {
+                timedDepth--;
+                const end = performance.now();
+                const call = stats.calls[name] || (stats.calls[name] = { count: 0, totalMs: 0, maxMs: 0 });
+                call.count++;
+                call.totalMs += end - start;
+                call.maxMs = Math.max(call.maxMs, end - start);
+                if (timedDepth === 0) {
+                    recentSpans.push({ name, start, end });
+                    if (recentSpans.length > MAX_SPANS) recentSpans.shift();
+                }
+            }
+        };
+    }
+
+    function attributeLongTask(entry) {
+        const longTasks = stats.longTasks;
+        const end = entry.startTime + entry.duration;
+        let overlapMs = 0;
+        recentSpans.forEach(span => {
+            const overlap = Math.min(end, span.end) - Math.max(entry.startTime, span.start);
+            if (overlap > 0) {
+                overlapMs += overlap;
+                longTasks.byCall[span.name] = (longTasks.byCall[span.name] || 0) + overlap;
+            }
+        });
+        longTasks.count++;
+        longTasks.totalMs += entry.duration;
+        if (overlapMs > 0) {
+            longTasks.hideui++;
+            longTasks.hideuiMs += overlapMs;
+        }
+    }
+
+    if (window.PerformanceObserver && (PerformanceObserver.supportedEntryTypes || []).includes("longtask")) {
+        new PerformanceObserver(list => list.getEntries().forEach(attributeLongTask))
+            .observe({ type: "longtask", buffered: true });
+    }
+
+    // --- STORAGE LOGIC ---
+
+    // One in-memory store is the source of truth for elements, prefs and
+    // order. Each slice is parsed from localStorage once; changes mark the
+    // slice dirty and dirty slices are written once per idle period.
+    const STORE_KEYS = {
+        elements: STORAGE_KEY_CUSTOM, prefs: STORAGE_KEY_PREFS,
+        order: STORAGE_KEY_ORDER, profiles: STORAGE_KEY_PROFILES
+    };
+    const STORE_DEFAULTS = { elements: () => [], prefs: () => ({}), order: () => [], profiles: () => ({}) };
+    const store = { elements: null, prefs: null, order: null, profiles: null };
+    const dirtySlices = new Set();
+    let persistHandle = null;
+
+    function readSlice(name) {
+        if (store[name] === null) {
+            try {
+                const saved = localStorage.getItem(STORE_KEYS[name]);
+                store[name] = saved ? JSON.parse(saved) : STORE_DEFAULTS[name]();
+            } catch (e) {
+                console.warn(`Failed to load ${name}:`, e);
+                store[name] = STORE_DEFAULTS[name]();
+            }
+        }
+        return store[name];
+    }
+
+    function writeSlice(name, value) {
+        store[name] = value;
+        dirtySlices.add(name);
+        if (persistHandle === null) {
+            persistHandle = window.requestIdleCallback
+                ? window.requestIdleCallback(persistStore, { timeout: 1000 })
+                : setTimeout(persistStore, 250);
+        }
+    }
+
+    function persistStore() {
+        persistHandle = null;
+        dirtySlices.forEach(name => {
+            try {
+                localStorage.setItem(STORE_KEYS[name], JSON.stringify(store[name]));
+            } catch (e) {
+                console.error(`Failed to save ${name}:`, e);
+            }
+        });
+        dirtySlices.clear();
+    }
+
+    // Forget unsaved changes and parsed slices, e.g. before clearing storage
+    function resetStore() {
+        dirtySlices.clear();
+        Object.keys(store).forEach(name => { store[name] = null; });
+    }
+
+    // Flush anything still pending when the page goes away
+    window.addEventListener("pagehide", persistStore);
+
+    function loadCustomElements() {
+        return readSlice("elements").slice();
+    }
+
+    function exportedElements() {
+        // `terms` is compiled from the labels by the plugin; config.json keeps only the labels
+        return loadCustomElements().map(({ terms, ...element }) => element);
+    }
+
+    function saveCustomElements(elements) {
+        writeSlice("elements", elements.slice());
+        queueConfigSave();
+    }
+
+    function loadPreferences() {
+        return readSlice("prefs");
+    }
+
+    function savePreferences(states) {
+        const prefs = readSlice("prefs");
+        states.forEach((checked, targetId) => {
+            prefs[targetId] = checked;
+        });
+        writeSlice("prefs", prefs);
+    }
+
+    function loadElementOrder() {
+        return readSlice("order");
+    }
+
+    // Map each id to its saved position so sorting is one lookup per id
+    function buildOrderRanks(order) {
+        const ranks = new Map();
+        order.forEach((id, index) => {
+            if (!ranks.has(id)) ranks.set(id, index);
+        });
+        return ranks;
+    }
+
+    function saveElementOrder() {
+        writeSlice("order", allTargets.map(t => t.id));
+        queueConfigSave();
+    }
+
+    function loadProfiles() {
+        return readSlice("profiles");
+    }
+
+    function saveProfiles(profiles) {
+        writeSlice("profiles", profiles);
+        queueConfigSave();
+    }
+
+    // --- BOOT SYNC ---
+
+    // config.json is copied into storage only when its hash differs from the
+    // last synced one. The synced copy is kept as a merge base: elements and
+    // order edited locally since then are kept, local prefs win, and
+    // everything else follows the file.
+    const STORAGE_KEY_HASH = "wan2gp_hideui_hash";
+    const STORAGE_KEY_BASE = "wan2gp_hideui_base";
+
+    function loadSyncBase() {
+        try {
+            const saved = localStorage.getItem(STORAGE_KEY_BASE);
+            return saved ? JSON.parse(saved) : null;
+        } catch (e) {
+            console.warn("Failed to load sync base:", e);
+            return null;
+        }
+    }
+
+    function mergeFileConfig(base) {
+        const fileElements = FILE_CONFIG.elements || [];
+        const fileOrder = FILE_CONFIG.order || [];
+        const localElements = readSlice("elements");
+        const localOrder = readSlice("order");
+        const baseById = new Map((base.elements || []).map(e => [e.id, JSON.stringify(e)]));
+        const localById = new Map(localElements.map(e => [e.id, e]));
+        const fileIds = new Set(fileElements.map(e => e.id));
+
+        const elements = [];
+        fileElements.forEach(fileEl => {
+            const localEl = localById.get(fileEl.id);
+            if (localEl) {
+                const edited = baseById.get(fileEl.id) !== JSON.stringify(localEl);
+                elements.push(edited ? localEl : fileEl);
+            } else if (!baseById.has(fileEl.id)) {
+                elements.push(fileEl); // New in the file; otherwise deleted locally
+            }
+        });
+        localElements.forEach(localEl => {
+            if (!fileIds.has(localEl.id) && !baseById.has(localEl.id)) {
+                elements.push(localEl); // Added locally, not exported yet
+            }
+        });
+
+        let order = fileOrder;
+        if (JSON.stringify(localOrder) !== JSON.stringify(base.order || [])) {
+            const kept = new Set(localOrder);
+            order = localOrder.concat(fileOrder.filter(id => !kept.has(id)));
+        }
+
+        // Profiles saved or changed locally since the last sync win by name
+        const profiles = Object.assign({}, FILE_CONFIG.profiles || {});
+        const baseProfiles = base.profiles || {};
+        Object.entries(readSlice("profiles")).forEach(([name, states]) => {
+            if (JSON.stringify(baseProfiles[name]) !== JSON.stringify(states)) {
+                profiles[name] = states;
+            }
+        });
+
+        return {
+            elements,
+            prefs: Object.assign({}, FILE_CONFIG.prefs || {}, readSlice("prefs")),
+            order,
+            profiles
+        };
+    }
+
+    function syncFileConfig() {
+        if (localStorage.getItem(STORAGE_KEY_HASH) === FILE_CONFIG.hash) return;
+
+        const base = loadSyncBase();
+        // Without a base, storage was last written by a full copy of the file
+        const synced = base ? mergeFileConfig(base) : {
+            elements: FILE_CONFIG.elements || [],
+            prefs: FILE_CONFIG.prefs || {},
+            order: FILE_CONFIG.order || [],
+            profiles: FILE_CONFIG.profiles || {}
+        };
+        // Copy, so edits in the store never alter FILE_CONFIG (the
+        // "Cached" badges compare against it)
+        const copy = JSON.parse(JSON.stringify(synced));
+        writeSlice("elements", copy.elements);
+        writeSlice("prefs", copy.prefs);
+        writeSlice("order", copy.order);
+        writeSlice("profiles", copy.profiles);
+        try {
+            localStorage.setItem(STORAGE_KEY_BASE, JSON.stringify({
+                elements: FILE_CONFIG.elements || [],
+                order: FILE_CONFIG.order || [],
+                profiles: FILE_CONFIG.profiles || {}
+            }));
+            localStorage.setItem(STORAGE_KEY_HASH, FILE_CONFIG.hash || "");
+        } catch (e) {
+            console.error("Failed to save sync base:", e);
+        }
+        console.log("WAN2GP HideUI: Synced config.json into local storage");
+    }
+
+    syncFileConfig();
+
+    // --- LIVE SAVE ---
+
+    // Edits are sent to the plugin through a hidden Gradio textbox and
+    // button. The first edit schedules one send; edits made before it
+    // fires ride along, so a burst of edits becomes one request.
+    const SAVE_DELAY_MS = 1000;
+    let saveTimer = null;
+
+    function queueConfigSave() {
+        if (saveTimer === null) {
+            saveTimer = setTimeout(sendConfigSave, SAVE_DELAY_MS);
+        }
+    }
+
+    function sendConfigSave() {
+        saveTimer = null;
+        const input = document.querySelector("#hideui-save-payload textarea, #hideui-save-payload input");
+        const button = document.getElementById("hideui-save-button");
+        if (!input || !button) return; // Bridge not available; Export still works
+
+        input.value = JSON.stringify({
+            elements: exportedElements(),
+            prefs: loadPreferences(),
+            order: loadElementOrder(),
+            profiles: loadProfiles()
+        });
+        input.dispatchEvent(new Event("input", { bubbles: true }));
+        button.click();
+    }
+
+    // --- SAFETY LOGIC ---
+
+    // Targets are hidden by one generated stylesheet. Resolved nodes are
+    // tagged with their target ids once and the root element lists the
+    // hidden ids, so any bulk toggle is a single attribute write.
+    const STYLE_ID = "wan2gp-hideui-style";
+    const hiddenTargetIds = new Set();
+
+    // Target ids can hold any character, so the attribute lists use a
+    // generated token per id instead (no whitespace, nothing to escape)
+    const targetTokens = new Map();
+
+    function targetToken(targetId) {
+        let token = targetTokens.get(targetId);
+        if (!token) {
+            token = `t${targetTokens.size}`;
+            targetTokens.set(targetId, token);
+        }
+        return token;
+    }
+    let styledTargetIds = null;
+
+    function tagNode(element, targetId) {
+        const token = targetToken(targetId);
+        const tags = (element.dataset.hideuiTarget || "").split(" ").filter(Boolean);
+        if (tags.includes(token)) return false;
+        tags.push(token);
+        element.dataset.hideuiTarget = tags.join(" ");
+        return true;
+    }
+
+    function updateTargetRules() {
+        const tokens = allTargets.map(t => targetToken(t.id));
+        const key = tokens.join(" ");
+        if (key === styledTargetIds) return;
+        styledTargetIds = key;
+
+        let style = document.getElementById(STYLE_ID);
+        if (!style) {
+            style = document.createElement("style");
+            style.id = STYLE_ID;
+            document.head.appendChild(style);
+        }
+        const rules = tokens.map(token =>
+            `html[data-hideui-hidden~="${token}"] [data-hideui-target~="${token}"] { display: none !important; }`);
+        rules.push("[data-hideui-collapsed] { display: none !important; }");
+        style.textContent = rules.join("\n");
+    }
+
+    function commitHiddenTargets() {
+        document.documentElement.dataset.hideuiHidden = Array.from(hiddenTargetIds, targetToken).join(" ");
+    }
+
+    // Parents are collapsed by reference counting: every node keeps a
+    // count of reasons it is hidden (targets plus its own collapse) and
+    // every container a count of hidden children, so each hide or show
+    // decides collapse and expand in O(1), even for shared containers.
+    const COLLAPSIBLE_TAGS = new Set(["DIV", "BUTTON", "SPAN", "INPUT", "LABEL", "FORM", "FIELDSET"]);
+    const MAX_COLLAPSE_DEPTH = 5;
+    const hideReasons = new WeakMap();
+    const containerCounts = new WeakMap();
+
+    function isNodeHidden(node) {
+        return node.style.display === "none" || hideReasons.has(node);
+    }
+
+    function isCollapsible(container) {
+        return !!container && container.tagName !== "BODY"
+            && !container.classList.contains("gradio-container") && container.id !== "root";
+    }
+
+    function getContainerCount(container) {
+        let count = containerCounts.get(container);
+        if (!count) {
+            const children = Array.from(container.children).filter(c => COLLAPSIBLE_TAGS.has(c.tagName));
+            count = { total: children.length, hidden: children.filter(isNodeHidden).length };
+            containerCounts.set(container, count);
+        }
+        return count;
+    }
+
+    function trackedCount(node) {
+        const parent = node.parentElement;
+        if (!COLLAPSIBLE_TAGS.has(node.tagName) || !isCollapsible(parent)) return null;
+        return getContainerCount(parent);
+    }
+
+    function safeHide(element, depth = 0) {
+        // The element itself is hidden by the stylesheet; only the
+        // counts and collapsed parents are maintained here
+        const count = trackedCount(element);
+        const wasHidden = isNodeHidden(element);
+        hideReasons.set(element, (hideReasons.get(element) || 0) + 1);
+        if (wasHidden || !count) return;
+
+        count.hidden++;
+        const parent = element.parentElement;
+        if (count.hidden === count.total && depth < MAX_COLLAPSE_DEPTH && parent.dataset.hideuiCollapsed !== "true") {
+            parent.dataset.hideuiCollapsed = "true";
+            safeHide(parent, depth + 1);
+        }
+    }
+
+    function safeShow(element) {
+        if (!hideReasons.has(element)) return;
+        const count = trackedCount(element);
+        const reasons = hideReasons.get(element) - 1;
+        if (reasons > 0) {
+            hideReasons.set(element, reasons);
+            return;
+        }
+        hideReasons.delete(element);
+        if (isNodeHidden(element) || !count) return;
+
+        count.hidden--;
+        const parent = element.parentElement;
+        if (parent.dataset.hideuiCollapsed === "true") {
+            delete parent.dataset.hideuiCollapsed;
+            safeShow(parent);
+        }
+    }
+
+    // --- COMPONENT INDEX ---
+
+    // One pass over the component-* nodes, reused by every target and
+    // term until the page DOM actually changes.
+    const COMPONENT_SELECTOR = "div[id^='component-'], button[id^='component-']";
+    let componentIndex = null;
+
+    function normalizeText(text) {
+        return text.replace(/\s+/g, ' ').trim().toLowerCase();
+    }
+
+    function buildParentMap(nodes) {
+        // Nodes are in document order, so a stack of open ancestors
+        // gives each node its nearest component parent.
+        const parentOf = new Map();
+        const stack = [];
+        nodes.forEach(el => {
+            while (stack.length && !stack[stack.length - 1].contains(el)) stack.pop();
+            parentOf.set(el, stack.length ? stack[stack.length - 1] : null);
+            stack.push(el);
+        });
+        return parentOf;
+    }
+
+    function pickInnermost(candidates, parentOf) {
+        // A node whose component child also matches is not innermost.
+        // Walk up from each candidate, stopping at already marked nodes.
+        const shadowed = new Set();
+        candidates.forEach(el => {
+            let parent = parentOf.get(el);
+            while (parent && !shadowed.has(parent)) {
+                shadowed.add(parent);
+                parent = parentOf.get(parent);
+            }
+        });
+        return candidates.filter(el => !shadowed.has(el));
+    }
+
+    function getComponentIndex() {
+        if (componentIndex) return componentIndex;
+        observePage();
+
+        const nodes = Array.from(document.querySelectorAll(COMPONENT_SELECTOR));
+        stats.nodesScanned += nodes.length;
+        const parentOf = buildParentMap(nodes);
+        componentIndex = { nodes, parentOf, texts: new Map(), labels: null, blockLabels: null, pageTargets: null, tables: {}, terms: new Map(), resolutions: null };
+        return componentIndex;
+    }
+
+    function getComponentText(index, el) {
+        let text = index.texts.get(el);
+        if (text === undefined) {
+            stats.innerTextReads++;
+            text = normalizeText(el.innerText || el.textContent || "");
+            index.texts.set(el, text);
+        }
+        return text;
+    }
+
+    // Label mode only reads the label-bearing nodes and climbs to the
+    // owning component; text mode matches each component's full text.
+    const LABEL_SELECTOR = "label, span[data-testid='block-label'], button, h1, h2, h3, h4, h5, h6";
+
+    // Aho-Corasick automaton compiled from every label by the plugin,
+    // so a node's text is scanned once for all terms.
+    const MATCHER = FILE_CONFIG.matcher || { patterns: [], targets: [], goto: [{}], fail: [0], out: [[]] };
+    const PATTERN_INDEX = new Map(MATCHER.patterns.map((pattern, i) => [pattern, i]));
+
+    function scanText(text) {
+        const hits = new Set();
+        let state = 0;
+        for (const char of text) {
+            while (state && MATCHER.goto[state][char] === undefined) state = MATCHER.fail[state];
+            state = MATCHER.goto[state][char] || 0;
+            MATCHER.out[state].forEach(pattern => hits.add(pattern));
+        }
+        return hits;
+    }
+
+    function targetsInText(text) {
+        const ids = new Set();
+        scanText(text).forEach(pattern => MATCHER.targets[pattern].forEach(id => ids.add(id)));
+        return ids;
+    }
+
+    function matchMode(target) {
+        return target.match === "label" ? "label" : "text";
+    }
+
+    // Elements from config.json carry their labels normalized by the
+    // Python compiler as `terms`; anything else is normalized here
+    function targetTerms(target) {
+        if (Array.isArray(target.terms)) return target.terms;
+        const labels = Array.isArray(target.labels) ? target.labels : [target.labels];
+        return Array.from(new Set(labels
+            .filter(label => typeof label === "string")
+            .map(label => normalizeText(label))
+            .filter(Boolean)));
+    }
+
+    function isCompiled(target) {
+        return targetTerms(target).every(term => PATTERN_INDEX.has(term));
+    }
+
+    function getLabelEntries(index) {
+        if (!index.labels) {
+            index.labels = [];
+            const labelNodes = document.querySelectorAll(LABEL_SELECTOR);
+            stats.nodesScanned += labelNodes.length;
+            labelNodes.forEach(node => {
+                const owner = node.closest(COMPONENT_SELECTOR);
+                if (owner) {
+                    index.labels.push({ owner, text: normalizeText(node.textContent || "") });
+                }
+            });
+        }
+        return index.labels;
+    }
+
+    function getPatternTable(index, mode) {
+        // pattern -> nodes whose text contains it, from one scan per node
+        if (!index.tables[mode]) {
+            const table = new Map();
+            const record = (pattern, el) => {
+                if (!table.has(pattern)) table.set(pattern, new Set());
+                table.get(pattern).add(el);
+            };
+            if (mode === "label") {
+                getLabelEntries(index).forEach(entry => {
+                    scanText(entry.text).forEach(pattern => record(pattern, entry.owner));
+                });
+            } else {
+                index.nodes.forEach(el => {
+                    scanText(getComponentText(index, el)).forEach(pattern => record(pattern, el));
+                });
+            }
+            index.tables[mode] = table;
+        }
+        return index.tables[mode];
+    }
+
+    function findInnermostMatches(term, mode = "text") {
+        const index = getComponentIndex();
+        const lbl = normalizeText(term);
+        const key = `${mode}:${lbl}`;
+        const cached = index.terms.get(key);
+        if (cached) return cached;
+
+        let candidates;
+        if (PATTERN_INDEX.has(lbl)) {
+            candidates = Array.from(getPatternTable(index, mode).get(PATTERN_INDEX.get(lbl)) || []);
+        } else if (mode === "label") {
+            const owners = new Set();
+            getLabelEntries(index).forEach(entry => {
+                if (entry.text.includes(lbl)) owners.add(entry.owner);
+            });
+            candidates = Array.from(owners);
+        } else {
+            candidates = index.nodes.filter(el => getComponentText(index, el).includes(lbl));
+        }
+
+        const targets = pickInnermost(candidates, index.parentOf);
+        index.terms.set(key, targets);
+        return targets;
+    }
+
+    // --- RESOLUTION CACHE ---
+
+    // Resolved component ids per label target, persisted across page
+    // loads and keyed by a fingerprint of the page layout and config.
+    const STORAGE_KEY_RESOLVED = "wan2gp_hideui_resolved";
+    const MAX_CACHED_LAYOUTS = 4;
+    let storedResolutions = null;
+    let resolutionsDirty = false;
+
+    function hashString(str) {
+        // FNV-1a, 32 bit
+        let hash = 0x811c9dc5;
+        for (let i = 0; i < str.length; i++) {
+            hash ^= str.charCodeAt(i);
+            hash = Math.imul(hash, 0x01000193);
+        }
+        return (hash >>> 0).toString(36);
+    }
+
+    const CONFIG_FINGERPRINT = hashString(JSON.stringify(FILE_CONFIG.elements || []));
+
+    function loadResolutions() {
+        if (storedResolutions) return storedResolutions;
+        try {
+            const saved = localStorage.getItem(STORAGE_KEY_RESOLVED);
+            storedResolutions = saved ? JSON.parse(saved) : {};
+        } catch (e) {
+            console.warn("Failed to load resolution cache:", e);
+            storedResolutions = {};
+        }
+        return storedResolutions;
+    }
+
+    function saveResolutions() {
+        if (!resolutionsDirty) return;
+        resolutionsDirty = false;
+        const layouts = Object.keys(storedResolutions)
+            .sort((a, b) => storedResolutions[b].time - storedResolutions[a].time);
+        layouts.slice(MAX_CACHED_LAYOUTS).forEach(key => delete storedResolutions[key]);
+        try {
+            localStorage.setItem(STORAGE_KEY_RESOLVED, JSON.stringify(storedResolutions));
+        } catch (e) {
+            console.error("Failed to save resolution cache:", e);
+        }
+    }
+
+    function getLayoutResolutions() {
+        // Ids are positional, so the ordered id list fingerprints the layout
+        const index = getComponentIndex();
+        if (!index.resolutions) {
+            const fingerprint = CONFIG_FINGERPRINT + ":" + hashString(index.nodes.map(el => el.id).join(","));
+            const stored = loadResolutions();
+            if (!stored[fingerprint]) {
+                stored[fingerprint] = { time: Date.now(), targets: {} };
+            }
+            index.resolutions = stored[fingerprint];
+        }
+        return index.resolutions;
+    }
+
+    function getPageTargets(index) {
+        // Compiled targets whose terms occur anywhere in the page text. A
+        // target absent from it cannot match in either mode.
+        if (!index.pageTargets) {
+            const root = document.querySelector(".gradio-container") || document.body;
+            index.pageTargets = targetsInText(normalizeText(root.textContent || ""));
+        }
+        return index.pageTargets;
+    }
+
+    function getCachedResolution(target) {
+        const entries = getLayoutResolutions().targets[target.id];
+        if (!entries) return null;
+
+        // An empty list is a cached miss for this layout. Blocks keep their
+        // ids while their text changes, so it only holds if the label is
+        // still nowhere on the page.
+        if (entries.length === 0) {
+            return isCompiled(target) && !getPageTargets(getComponentIndex()).has(target.id) ? [] : null;
+        }
+
+        // Cheap check: each cached node must still carry its label
+        const elements = [];
+        for (const [componentId, term] of entries) {
+            const element = document.getElementById(componentId);
+            if (!element || !normalizeText(element.textContent || "").includes(term)) return null;
+            elements.push(element);
+        }
+        return elements;
+    }
+
+    function storeResolution(targetId, entries) {
+        const layout = getLayoutResolutions();
+        layout.targets[targetId] = entries;
+        layout.time = Date.now();
+        resolutionsDirty = true;
+    }
+
+    // --- COMPONENT FINGERPRINTS ---
+
+    // Gradio numbers component-* ids by position, so picked elements also
+    // record what survives a layout change: the elem_id and elem_classes,
+    // the block label and a path from the nearest ancestor with a stable
+    // id. The resolver tries those lookups cheapest first.
+    const POSITIONAL_ID = /^component-\d+$/;
+    const BLOCK_LABEL_SELECTOR = "label, span[data-testid='block-label']";
+    const GRADIO_CLASSES = new Set([
+        "block", "padded", "hidden", "hide-container", "row", "column", "form", "gap", "panel",
+        "compact", "unequal-height", "equal-height", "stretch", "wrap", "flex", "fixed-height",
+        "auto-margin", "border_focus", "gr-group", "styler"
+    ]);
+
+    function isStableId(id) {
+        return Boolean(id) && !POSITIONAL_ID.test(id);
+    }
+
+    function userClasses(el) {
+        return Array.from(el.classList)
+            .filter(name => !GRADIO_CLASSES.has(name) && !name.startsWith("svelte-"))
+            .sort();
+    }
+
+    function blockLabelOf(component) {
+        const labelNode = component.querySelector(BLOCK_LABEL_SELECTOR);
+        return labelNode ? normalizeText(labelNode.textContent || "") : "";
+    }
+
+    function labelOwner(labelNode, depth) {
+        // The component `depth` levels above the block holding the label
+        let owner = labelNode.closest(PICKER_SELECTOR);
+        for (let i = 0; owner && i < depth; i++) {
+            owner = owner.parentElement && owner.parentElement.closest(PICKER_SELECTOR);
+        }
+        return owner;
+    }
+
+    function createFingerprint(component) {
+        const fingerprint = {};
+        if (isStableId(component.id)) fingerprint.elemId = component.id;
+        const classes = userClasses(component);
+        if (classes.length) fingerprint.classes = classes;
+
+        const labelNode = component.querySelector(BLOCK_LABEL_SELECTOR);
+        const label = labelNode ? normalizeText(labelNode.textContent || "") : "";
+        if (label) {
+            // Component levels between the label's own block and this one
+            let depth = 0;
+            let owner = labelNode.closest(PICKER_SELECTOR);
+            while (owner && owner !== component) {
+                owner = owner.parentElement && owner.parentElement.closest(PICKER_SELECTOR);
+                depth++;
+            }
+            fingerprint.label = label;
+            fingerprint.labelDepth = depth;
+        }
+
+        // Child positions up to the nearest ancestor with a stable id
+        const path = [];
+        let node = component;
+        while (node.parentElement && node !== document.body) {
+            path.unshift(Array.prototype.indexOf.call(node.parentElement.children, node));
+            node = node.parentElement;
+            if (isStableId(node.id)) {
+                fingerprint.anchor = node.id;
+                break;
+            }
+        }
+        fingerprint.path = path;
+        return fingerprint;
+    }
+
+    function hasClasses(el, fingerprint) {
+        return !fingerprint.classes || fingerprint.classes.every(name => el.classList.contains(name));
+    }
+
+    function fitsFingerprint(el, fingerprint) {
+        if (!hasClasses(el, fingerprint)) return false;
+        return !fingerprint.label || blockLabelOf(el) === fingerprint.label;
+    }
+
+    function getBlockLabels(index) {
+        // normalized label text -> label nodes, one scan shared by all targets
+        if (!index.blockLabels) {
+            index.blockLabels = new Map();
+            const labelNodes = document.querySelectorAll(BLOCK_LABEL_SELECTOR);
+            stats.nodesScanned += labelNodes.length;
+            labelNodes.forEach(node => {
+                const text = normalizeText(node.textContent || "");
+                if (!index.blockLabels.has(text)) index.blockLabels.set(text, []);
+                index.blockLabels.get(text).push(node);
+            });
+        }
+        return index.blockLabels;
+    }
+
+    function followPath(fingerprint) {
+        let node = fingerprint.anchor ? document.getElementById(fingerprint.anchor) : document.body;
+        for (const position of fingerprint.path) {
+            if (!node) return null;
+            node = node.children[position];
+        }
+        return node && node.matches(PICKER_SELECTOR) && hasClasses(node, fingerprint) ? node : null;
+    }
+
+    function confirmsComponentId(element, target) {
+        // After a relayout a positional id can name another block. It is
+        // only trusted when a label or class check ran, or the path agrees.
+        const fingerprint = target.fingerprint;
+        if (!fingerprint || !POSITIONAL_ID.test(element.id)) return true;
+        if (fingerprint.label || fingerprint.classes) return true;
+        return Boolean(fingerprint.path) && followPath(fingerprint) === element;
+    }
+
+    function resolveFingerprint(target, root = null) {
+        // Targets picked before fingerprints only have their componentId
+        const fingerprint = target.fingerprint || {};
+        const inScope = el => Boolean(el) && (!root || root.contains(el));
+
+        // 1. Direct lookups: the elem_id, then the last known component id
+        if (fingerprint.elemId) {
+            const element = document.getElementById(fingerprint.elemId);
+            if (inScope(element)) return element;
+        }
+        if (target.componentId) {
+            const element = document.getElementById(target.componentId);
+            if (inScope(element) && fitsFingerprint(element, fingerprint) && confirmsComponentId(element, target)) {
+                return element;
+            }
+        }
+
+        // 2. The block label, from the shared index (or the changed subtree)
+        if (fingerprint.label) {
+            const labelNodes = root
+                ? Array.from(root.querySelectorAll(BLOCK_LABEL_SELECTOR))
+                    .filter(node => normalizeText(node.textContent || "") === fingerprint.label)
+                : getBlockLabels(getComponentIndex()).get(fingerprint.label) || [];
+            const owners = labelNodes
+                .map(node => labelOwner(node, fingerprint.labelDepth || 0))
+                .filter(owner => inScope(owner) && fitsFingerprint(owner, fingerprint));
+            if (owners.length === 1) return owners[0];
+            if (owners.length > 1) {
+                // Same label twice: the structural path breaks the tie
+                const byPath = fingerprint.path && followPath(fingerprint);
+                return owners.includes(byPath) ? byPath : owners[0];
+            }
+        }
+
+        // 3. The structural path
+        if (fingerprint.path) {
+            const element = followPath(fingerprint);
+            if (inScope(element)) return element;
+        }
+        return null;
+    }
+
+    // --- VISIBILITY LOGIC ---
+
+    function resolveTarget(target) {
+        if (target.labels) {
+            const cached = getCachedResolution(target);
+            if (cached) return cached;
+
+            // Full scan only when the cached nodes fail the check
+            const mode = matchMode(target);
+            const elements = [];
+            const entries = [];
+            targetTerms(target).forEach(term => {
+                findInnermostMatches(term, mode).forEach(el => {
+                    elements.push(el);
+                    entries.push([el.id, term]);
+                });
+            });
+            storeResolution(target.id, entries);
+            return elements;
+        }
+        if (target.componentId || target.fingerprint) {
+            const element = resolveFingerprint(target);
+            return element ? [element] : [];
+        }
+        return [];
+    }
+
+    // What each target was last applied as, so later passes can skip it
+    const appliedTargets = new Map();
+
+    // Batch engine: resolve every target first (read phase), then tag
+    // nodes, flip the root attribute once and collapse parents.
+    function applyVisibility(states) {
+        const targetsById = new Map(allTargets.map(t => [t.id, t]));
+        const plan = [];
+        states.forEach((shouldShow, targetId) => {
+            const target = targetsById.get(targetId);
+            if (target) {
+                plan.push({ targetId, elements: resolveTarget(target), shouldShow });
+            }
+        });
+
+        updateTargetRules();
+        const shown = [];
+        const hidden = [];
+        plan.forEach(({ targetId, elements, shouldShow }) => {
+            // Only nodes whose hidden state changes touch the counts
+            const previous = appliedTargets.get(targetId);
+            const counted = previous && !previous.shouldShow ? previous.elements : [];
+            const next = shouldShow ? [] : elements;
+            shown.push(...counted.filter(el => !next.includes(el)));
+            hidden.push(...next.filter(el => !counted.includes(el)));
+
+            elements.forEach(el => tagNode(el, targetId));
+            if (shouldShow) {
+                hiddenTargetIds.delete(targetId);
+            } else {
+                hiddenTargetIds.add(targetId);
+            }
+            appliedTargets.set(targetId, { elements, shouldShow });
+        });
+        commitHiddenTargets();
+
+        shown.forEach(el => safeShow(el));
+        hidden.forEach(el => safeHide(el));
+        saveResolutions();
+    }
+
+    function initialStatusFor(target, savedPrefs) {
+        return savedPrefs.hasOwnProperty(target.id)
+            ? savedPrefs[target.id]
+            : (target.default !== undefined ? target.default : true);
+    }
+
+    function loadTargets() {
+        allTargets = loadCustomElements();
+
+        // Apply saved order; unranked elements keep their place at the end
+        const savedRanks = buildOrderRanks(loadElementOrder());
+        if (savedRanks.size > 0) {
+            const unranked = savedRanks.size;
+            allTargets.sort((a, b) => {
+                const aRank = savedRanks.has(a.id) ? savedRanks.get(a.id) : unranked;
+                const bRank = savedRanks.has(b.id) ? savedRanks.get(b.id) : unranked;
+                return aRank - bRank;
+            });
+        }
+    }
+
+    function applyStoredVisibility(savedPrefs = loadPreferences()) {
+        // Targets not applied yet get their saved state, in one batch
+        const initialStates = new Map();
+        allTargets.forEach(target => {
+            if (!appliedTargets.has(target.id)) {
+                initialStates.set(target.id, initialStatusFor(target, savedPrefs));
+            }
+        });
+        if (initialStates.size > 0) {
+            applyVisibility(initialStates);
+        }
+    }
+
+    // --- PROFILES ---
+
+    // A profile lists only the states it sets; other targets use their
+    // default. Switching diffs the full state against the applied one and
+    // applies only the targets that change, in one batch, from cached
+    // resolutions. Profiles still as in config.json use the full snapshot
+    // the plugin compiled; saved or edited ones are expanded here.
+    const PROFILE_SNAPSHOTS = FILE_CONFIG.profileSnapshots || {};
+
+    function profileState(profile, target) {
+        return profile.hasOwnProperty(target.id) ? profile[target.id] : target.default !== false;
+    }
+
+    function applyProfile(name) {
+        const profile = loadProfiles()[name];
+        if (!profile) return;
+        const fileProfile = (FILE_CONFIG.profiles || {})[name];
+        const snapshot = JSON.stringify(profile) === JSON.stringify(fileProfile) ? PROFILE_SNAPSHOTS[name] : null;
+        const states = new Map();
+        allTargets.forEach(target => {
+            const shouldShow = snapshot && snapshot.hasOwnProperty(target.id)
+                ? snapshot[target.id]
+                : profileState(profile, target);
+            const current = appliedTargets.get(target.id);
+            if (!current || current.shouldShow !== shouldShow) {
+                states.set(target.id, shouldShow);
+            }
+        });
+        if (states.size === 0) return;
+
+        states.forEach((shouldShow, targetId) => {
+            const cb = document.getElementById(`cb-${targetId}`);
+            if (cb) cb.checked = shouldShow;
+        });
+        applyVisibility(states);
+        savePreferences(states);
+    }
+
+    function saveCurrentAsProfile(name) {
+        // Only the states that differ from the defaults, like config.json
+        const profile = {};
+        allTargets.forEach(target => {
+            const current = appliedTargets.get(target.id);
+            if (current && current.shouldShow !== (target.default !== false)) {
+                profile[target.id] = current.shouldShow;
+            }
+        });
+        saveProfiles(Object.assign({}, loadProfiles(), { [name]: profile }));
+    }
+
+    // --- PAGE OBSERVER ---
+
+    // Scoped to the Gradio container so a re-render only costs work
+    // for the added subtrees. Inline style resets need no handling:
+    // the generated stylesheet wins over them.
+    let pageObserver = null;
+
+    function observePage() {
+        if (pageObserver) return;
+        const root = document.querySelector(".gradio-container");
+        if (!root) return;
+        pageObserver = new MutationObserver(handlePageMutations);
+        pageObserver.observe(root, { childList: true, subtree: true, characterData: true });
+    }
+
+    function movesComponents(record, selector) {
+        // Added or removed nodes that are, or hold, a component
+        const isComponentTree = node => node.nodeType === 1
+            && (node.matches(selector) || node.querySelector(selector) !== null);
+        return Array.from(record.addedNodes).some(isComponentTree)
+            || Array.from(record.removedNodes).some(isComponentTree);
+    }
+
+    function handlePageMutations(records) {
+        const roots = [];
+        records.forEach(record => {
+            if (record.type === "childList") {
+                containerCounts.delete(record.target);
+                // Streamed text leaves the component list and the measured
+                // rects alone; new nodes in it are matched below
+                if (componentIndex && movesComponents(record, COMPONENT_SELECTOR)) {
+                    componentIndex = null;
+                }
+                if (pickerIndex && !pickerIndex.dirty && movesComponents(record, PICKER_SELECTOR)) {
+                    pickerIndex.dirty = true;
+                }
+            }
+            if (record.type === "characterData") {
+                roots.push(record.target.parentElement);
+            } else {
+                record.addedNodes.forEach(node => {
+                    roots.push(node.nodeType === 1 ? node : node.parentElement);
+                });
+            }
+        });
+
+        if (!lifecycle.booted || roots.length === 0) return;
+        const hiddenTargets = allTargets.filter(target => {
+            const applied = appliedTargets.get(target.id);
+            return applied && !applied.shouldShow;
+        });
+        if (hiddenTargets.length === 0) return;
+
+        // Skip detached roots and roots nested in another root
+        const changed = roots.filter((root, i) => root && root.isConnected
+            && !roots.some((other, j) => other && j !== i && other !== root && other.contains(root))
+            && roots.indexOf(root) === i);
+
+        changed.forEach(root => {
+            // One automaton pass over the root finds every compiled target in
+            // it. textContent needs no layout, unlike innerText, which
+            // matters while generation streams status text.
+            const rootText = normalizeText(root.textContent || "");
+            const hitIds = targetsInText(rootText);
+            hiddenTargets.forEach(target => {
+                if (target.labels && isCompiled(target) && !hitIds.has(target.id)) return;
+                matchChangedSubtree(root, target, rootText).forEach(el => {
+                    if (!tagNode(el, target.id)) return;
+                    safeHide(el);
+                    appliedTargets.get(target.id).elements.push(el);
+                });
+            });
+        });
+        lifecycle.updates++;
+    }
+
+    function matchChangedSubtree(root, target, rootText) {
+        if (target.componentId || target.fingerprint) {
+            const element = resolveFingerprint(target, root);
+            return element ? [element] : [];
+        }
+        if (!target.labels) return [];
+
+        const terms = targetTerms(target);
+        if (matchMode(target) === "label") {
+            const labelNodes = Array.from(root.querySelectorAll(LABEL_SELECTOR));
+            const enclosing = root.closest(LABEL_SELECTOR);
+            if (enclosing) labelNodes.unshift(enclosing);
+            stats.nodesScanned += labelNodes.length;
+            const owners = new Set();
+            labelNodes.forEach(node => {
+                const text = normalizeText(node.textContent || "");
+                if (!terms.some(term => text.includes(term))) return;
+                const owner = node.closest(COMPONENT_SELECTOR);
+                if (owner) owners.add(owner);
+            });
+            return Array.from(owners);
+        }
+
+        const hitTerms = terms.filter(term => rootText.includes(term));
+        if (hitTerms.length === 0) return [];
+
+        const nodes = Array.from(root.querySelectorAll(COMPONENT_SELECTOR));
+        if (root.matches(COMPONENT_SELECTOR)) nodes.unshift(root);
+        stats.nodesScanned += nodes.length;
+        const parentOf = buildParentMap(nodes);
+        const matches = [];
+        const texts = new Map(nodes.map(el => [el, normalizeText(el.textContent || "")]));
+        hitTerms.forEach(term => {
+            const candidates = nodes.filter(el => texts.get(el).includes(term));
+            if (candidates.length > 0) {
+                matches.push(...pickInnermost(candidates, parentOf));
+            } else {
+                // The label landed outside any component in the subtree
+                const owner = root.parentElement && root.parentElement.closest(COMPONENT_SELECTOR);
+                if (owner) matches.push(owner);
+            }
+        });
+        return matches;
+    }
+
+    // --- ELEMENT PICKER ---
+
+    // On entry the picker measures every component once into a grid of
+    // page-coordinate rects. The pointer is hit-tested against that grid;
+    // all components under it form a stack (innermost first) that the
+    // arrow keys walk. Page scroll needs no re-measure; inner scrolling,
+    // resizes and page updates rebuild the index in the next frame.
+    const PICKER_SELECTOR = "div[id^='component-'], div.block[id]"; // blocks with an elem_id keep it as id
+    const PICKER_CELL_SIZE = 200;
+    let pickerIndex = null; // { grid: Map "cx,cy" -> entries, byElement: Map, dirty }
+
+    const overlayState = {
+        pendingPoint: null, // last pointer position, viewport coordinates
+        point: null,
+        stack: [], // index entries under the pointer, innermost first
+        depth: 0, // position in stack chosen with the arrow keys
+        frame: null,
+        size: ""
+    };
+
+    function measureEntry(el, scrollX, scrollY) {
+        const r = el.getBoundingClientRect();
+        return {
+            el,
+            left: r.left + scrollX,
+            top: r.top + scrollY,
+            right: r.left + r.width + scrollX,
+            bottom: r.top + r.height + scrollY,
+            area: r.width * r.height
+        };
+    }
+
+    function buildPickerIndex() {
+        const grid = new Map();
+        const byElement = new Map();
+        const scrollX = window.scrollX;
+        const scrollY = window.scrollY;
+        // All reads happen here, in one batch
+        document.querySelectorAll(PICKER_SELECTOR).forEach(el => {
+            if (el.closest("#floating-toggle-container")) return;
+            const entry = measureEntry(el, scrollX, scrollY);
+            if (entry.area === 0) return;
+            byElement.set(el, entry);
+            const x0 = Math.floor(entry.left / PICKER_CELL_SIZE);
+            const x1 = Math.floor((entry.right - 1) / PICKER_CELL_SIZE);
+            const y0 = Math.floor(entry.top / PICKER_CELL_SIZE);
+            const y1 = Math.floor((entry.bottom - 1) / PICKER_CELL_SIZE);
+            for (let cx = x0; cx <= x1; cx++) {
+                for (let cy = y0; cy <= y1; cy++) {
+                    const key = `${cx},${cy}`;
+                    let cell = grid.get(key);
+                    if (!cell) grid.set(key, cell = []);
+                    cell.push(entry);
+                }
+            }
+        });
+        pickerIndex = { grid, byElement, dirty: false };
+    }
+
+    function hitTest(clientX, clientY) {
+        const x = clientX + window.scrollX;
+        const y = clientY + window.scrollY;
+        const key = `${Math.floor(x / PICKER_CELL_SIZE)},${Math.floor(y / PICKER_CELL_SIZE)}`;
+        const cell = pickerIndex.grid.get(key) || [];
+        return cell
+            .filter(entry => x >= entry.left && x < entry.right && y >= entry.top && y < entry.bottom)
+            .sort((a, b) => a.area - b.area);
+    }
+
+    function indexEntryFor(el) {
+        return pickerIndex.byElement.get(el) || measureEntry(el, window.scrollX, window.scrollY);
+    }
+
+    function pickedComponent() {
+        const entry = overlayState.stack[overlayState.depth];
+        return entry ? entry.el : null;
+    }
+
+    function createHighlightOverlay() {
+        const overlay = document.createElement("div");
+        overlay.id = "wan2gp-picker-overlay";
+        Object.assign(overlay.style, {
+            position: "fixed",
+            left: "0",
+            top: "0",
+            boxSizing: "border-box",
+            pointerEvents: "none",
+            border: "3px solid #0284c7",
+            background: "rgba(2, 132, 199, 0.1)",
+            zIndex: "999998",
+            display: "none",
+            contain: "strict",
+            willChange: "transform",
+            transition: "transform 0.08s ease-out"
+        });
+        document.body.appendChild(overlay);
+        return overlay;
+    }
+
+    function scheduleOverlayFrame() {
+        if (overlayState.frame === null) {
+            overlayState.frame = requestAnimationFrame(renderOverlayFrame);
+        }
+    }
+
+    function renderOverlayFrame() {
+        overlayState.frame = null;
+        if (!pickerMode || !highlightOverlay) return;
+
+        if (!pickerIndex || pickerIndex.dirty) {
+            buildPickerIndex();
+            if (overlayState.point && !overlayState.pendingPoint) {
+                overlayState.pendingPoint = overlayState.point; // Re-hit the same spot
+            }
+        }
+        if (overlayState.pendingPoint) {
+            const point = overlayState.pendingPoint;
+            overlayState.pendingPoint = null;
+            overlayState.point = point;
+            const stack = hitTest(point.x, point.y);
+            const current = pickedComponent();
+            const kept = stack.findIndex(entry => entry.el === current);
+            overlayState.stack = stack;
+            overlayState.depth = kept === -1 ? 0 : kept;
+        }
+
+        const entry = overlayState.stack[overlayState.depth];
+        if (!entry || !entry.el.isConnected) {
+            highlightOverlay.style.display = "none";
+            return;
+        }
+
+        const width = entry.right - entry.left;
+        const height = entry.bottom - entry.top;
+        const size = `${width}x${height}`;
+        if (size !== overlayState.size) {
+            highlightOverlay.style.width = width + "px";
+            highlightOverlay.style.height = height + "px";
+            overlayState.size = size;
+        }
+        const left = entry.left - window.scrollX;
+        const top = entry.top - window.scrollY;
+        highlightOverlay.style.transform = `translate3d(${left}px, ${top}px, 0)`;
+        highlightOverlay.style.display = "block";
+    }
+
+    function handlePickerScroll(e) {
+        // Page scroll only moves the overlay; inner scrollers move components
+        if (pickerIndex && e.target !== document && e.target !== document.documentElement) {
+            pickerIndex.dirty = true;
+        }
+        scheduleOverlayFrame();
+    }
+
+    function handlePickerResize() {
+        if (pickerIndex) pickerIndex.dirty = true;
+        scheduleOverlayFrame();
+    }
+
+    function handlePickerMove(e) {
+        if (!pickerMode) return;
+        // Skip our own UI
+        if (e.target && e.target.closest && e.target.closest("#floating-toggle-container")) return;
+
+        // Only remember the latest position; the frame does the work
+        overlayState.pendingPoint = { x: e.clientX, y: e.clientY };
+        scheduleOverlayFrame();
+    }
+
+    // ArrowUp walks to the enclosing component, ArrowDown back toward the
+    // innermost one (or into the first child component), Enter picks.
+    function handlePickerKey(e) {
+        if (!pickerMode) return;
+        const current = pickedComponent();
+        if (e.key === "Escape") {
+            exitPickerMode();
+        } else if (e.key === "Enter") {
+            if (current) addPickedComponent(current);
+        } else if (e.key === "ArrowUp" && current) {
+            if (overlayState.depth < overlayState.stack.length - 1) {
+                overlayState.depth++;
+            } else {
+                const parent = current.parentElement && current.parentElement.closest(PICKER_SELECTOR);
+                if (!parent) return;
+                overlayState.stack.push(indexEntryFor(parent));
+                overlayState.depth = overlayState.stack.length - 1;
+            }
+        } else if (e.key === "ArrowDown" && current) {
+            if (overlayState.depth > 0) {
+                overlayState.depth--;
+            } else {
+                const child = current.querySelector(PICKER_SELECTOR);
+                if (!child) return;
+                overlayState.stack.unshift(indexEntryFor(child));
+            }
+        } else {
+            return;
+        }
+        e.preventDefault();
+        scheduleOverlayFrame();
+    }
+
+    function enterPickerMode() {
+        pickerMode = true;
+        document.body.style.cursor = "crosshair";
+
+        if (!highlightOverlay) {
+            highlightOverlay = createHighlightOverlay();
+        }
+
+        // Update button text
+        const addBtn = document.getElementById("wan2gp-add-element-btn");
+        if (addBtn) {
+            addBtn.textContent = "❌ Cancel";
+            addBtn.style.background = "#dc2626";
+        }
+
+        // Add status message
+        let statusMsg = document.getElementById("wan2gp-picker-status");
+        if (!statusMsg) {
+            statusMsg = document.createElement("div");
+            statusMsg.id = "wan2gp-picker-status";
+            Object.assign(statusMsg.style, {
+                fontSize: "12px",
+                color: "#60a5fa",
+                padding: "8px",
+                borderTop: "1px solid #555",
+                marginTop: "8px",
+                textAlign: "center"
+            });
+            statusMsg.textContent = "Click any element to add it (↑/↓ parent/child, Enter to pick)...";
+            document.getElementById("floating-menu").appendChild(statusMsg);
+        }
+
+        pickerIndex = null; // Measured in the first frame
+        document.addEventListener("mousemove", handlePickerMove, { passive: true });
+        document.addEventListener("click", selectElement, true);
+        document.addEventListener("keydown", handlePickerKey, true);
+        document.addEventListener("scroll", handlePickerScroll, { capture: true, passive: true });
+        window.addEventListener("resize", handlePickerResize);
+    }
+
+    function exitPickerMode() {
+        pickerMode = false;
+        document.body.style.cursor = "";
+
+        if (highlightOverlay) {
+            highlightOverlay.style.display = "none";
+        }
+        if (overlayState.frame !== null) {
+            cancelAnimationFrame(overlayState.frame);
+        }
+        Object.assign(overlayState, { pendingPoint: null, point: null, stack: [], depth: 0, frame: null });
+        pickerIndex = null;
+
+        const addBtn = document.getElementById("wan2gp-add-element-btn");
+        if (addBtn) {
+            addBtn.textContent = "➕ Add Element";
+            addBtn.style.background = "#16a34a";
+        }
+
+        const statusMsg = document.getElementById("wan2gp-picker-status");
+        if (statusMsg) {
+            statusMsg.remove();
+        }
+
+        document.removeEventListener("mousemove", handlePickerMove, { passive: true });
+        document.removeEventListener("click", selectElement, true);
+        document.removeEventListener("keydown", handlePickerKey, true);
+        document.removeEventListener("scroll", handlePickerScroll, { capture: true, passive: true });
+        window.removeEventListener("resize", handlePickerResize);
+    }
+
+    function selectElement(e) {
+        if (!pickerMode) return;
+
+        e.preventDefault();
+        e.stopPropagation();
+
+        const target = e.target;
+
+        // Skip our own UI
+        if (target.closest("#floating-toggle-container")) return;
+
+        // Prefer what the overlay shows (it may have been walked with the keys)
+        const highlighted = pickedComponent();
+        const related = highlighted && (highlighted.contains(target) || target.contains(highlighted));
+        const component = related ? highlighted : target.closest(PICKER_SELECTOR);
+        if (!component) return;
+        addPickedComponent(component);
+    }
+
+    function addPickedComponent(component) {
+        // Get element info
+        const componentId = component.id;
+        const label = component.querySelector("label, span[data-testid='block-label']");
+        let elementName = label ? label.textContent.trim() : "";
+
+        if (!elementName) {
+            // Try to get any text
+            const firstText = component.querySelector("span, p, h1, h2, h3");
+            elementName = firstText ? firstText.textContent.trim().substring(0, 50) : `Component ${componentId}`;
+        }
+
+        // Prompt for custom name
+        const customName = prompt("Enter a name for this element:", elementName);
+        if (!customName) {
+            exitPickerMode();
+            return;
+        }
+
+        // Create custom element
+        const customId = "custom_" + customName.toLowerCase().replace(/[^a-z0-9]/g, '_');
+        const customElement = {
+            id: customId,
+            name: customName,
+            componentId: componentId,
+            fingerprint: createFingerprint(component),
+            isCustom: true,
+            default: true  // New custom elements start visible by default
+        };
+
+        // Save to storage
+        const customElements = loadCustomElements();
+        customElements.push(customElement);
+        saveCustomElements(customElements);
+
+        // Exit picker mode and refresh UI
+        exitPickerMode();
+        buildMenuContent(); // Rebuild menu content
+    }
+
+    // --- UI CREATION ---
+
+    // Menu rows are cloned from one template, keyed by target id and
+    // patched in place; one delegated listener per event type on
+    // #floating-menu handles every row.
+    const MENU_STYLE_ID = "wan2gp-hideui-menu-style";
+    const MENU_CSS = `
+        #hideui-save-bridge { display: none !important; }
+        #floating-menu .hideui-row { display: flex; align-items: center; gap: 6px; padding: 2px 4px; background: transparent; border-radius: 4px; margin-bottom: 2px; cursor: default; }
+        #floating-menu.hideui-edit .hideui-row { padding: 6px 4px; background: #2a2f3a; margin-bottom: 4px; cursor: move; }
+        #floating-menu .hideui-row.is-dragging { opacity: 0.5; }
+        #floating-menu .hideui-row.is-drop-target { border-top: 2px solid #60a5fa; }
+        #floating-menu .hideui-drag { cursor: move; color: #888; font-size: 16px; user-select: none; }
+        #floating-menu .hideui-check { cursor: pointer; accent-color: #0284c7; }
+        #floating-menu .hideui-name { flex: 1; font-size: 13px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; cursor: default; }
+        #floating-menu.hideui-edit .hideui-name { cursor: move; }
+        #floating-menu .hideui-cached { font-size: 10px; background: #eab308; color: #000; padding: 2px 6px; border-radius: 3px; font-weight: bold; }
+        #floating-menu .hideui-star { background: transparent; border: none; color: #fbbf24; cursor: pointer; font-size: 18px; padding: 4px; }
+        #floating-menu .hideui-row:not(.is-default) .hideui-star { color: #6b7280; }
+        #floating-menu .hideui-rename, #floating-menu .hideui-delete { background: transparent; border: none; cursor: pointer; font-size: 14px; padding: 2px 4px; }
+        #floating-menu .hideui-delete { color: #dc2626; }
+        #floating-menu .hideui-row:not(.is-modified) .hideui-cached { display: none; }
+        #floating-menu:not(.hideui-edit) .hideui-drag,
+        #floating-menu:not(.hideui-edit) .hideui-cached,
+        #floating-menu:not(.hideui-edit) .hideui-rename,
+        #floating-menu:not(.hideui-edit) .hideui-delete { display: none; }
+        #floating-menu:not(.hideui-edit) .hideui-star { font-size: 14px; padding: 0; pointer-events: none; }
+        #floating-menu:not(.hideui-edit) .hideui-row:not(.is-default) .hideui-star { display: none; }
+    `;
+    const ROW_TEMPLATE = document.createElement("template");
+    ROW_TEMPLATE.innerHTML = `<div class="hideui-row" draggable="true">`
+        + `<span class="hideui-drag">≡</span>`
+        + `<input type="checkbox" class="hideui-check">`
+        + `<span class="hideui-name"></span>`
+        + `<span class="hideui-cached">Cached</span>`
+        + `<button class="hideui-star" data-action="star"></button>`
+        + `<button class="hideui-rename" data-action="rename" title="Rename element">✏️</button>`
+        + `<button class="hideui-delete" data-action="delete" title="Delete element">✕</button>`
+        + `</div>`;
+
+    let menuElement = null; // Global reference to menu
+    let menuHeader = null;
+    let headerEditMode = null;
+    const menuRows = new Map(); // target id -> { row, state }
+    let orderRanks = new Map(); // target id -> index in allTargets
+    let orderDirty = false;
+    const originalById = new Map((originalConfig.elements || []).map(e => [e.id, e]));
+
+    function isModified(target) {
+        const originalElement = originalById.get(target.id);
+        if (!originalElement) return true; // New element
+        return originalElement.name !== target.name; // Renamed
+    }
+
+    function createRow(target, checked) {
+        const row = ROW_TEMPLATE.content.firstElementChild.cloneNode(true);
+        row.dataset.targetId = target.id;
+        const checkbox = row.querySelector(".hideui-check");
+        checkbox.id = `cb-${target.id}`;
+        checkbox.checked = checked;
+        return { row, state: {} };
+    }
+
+    // The checkbox owns its checked state; everything else is patched
+    function patchRow(entry, target) {
+        // Only write the fields that differ from what the row shows
+        const { row, state } = entry;
+        const isDefault = target.default !== false; // Default to true if undefined
+        const modified = isModified(target);
+        if (state.name !== target.name) {
+            row.querySelector(".hideui-name").textContent = target.name;
+            state.name = target.name;
+        }
+        if (state.isDefault !== isDefault) {
+            const star = row.querySelector(".hideui-star");
+            star.textContent = isDefault ? "⭐" : "☆";
+            star.title = isDefault ? "Starts visible (click to toggle)" : "Starts hidden (click to toggle)";
+            row.classList.toggle("is-default", isDefault);
+            state.isDefault = isDefault;
+        }
+        if (state.modified !== modified) {
+            row.classList.toggle("is-modified", modified);
+            state.modified = modified;
+        }
+    }
+
+    function renderRow(target) {
+        const entry = menuRows.get(target.id);
+        if (entry) {
+            patchRow(entry, target);
+        }
+    }
+
+    function renderRows(savedPrefs) {
+        const seen = new Set();
+        let cursor = menuHeader ? menuHeader.nextSibling : menuElement.firstChild;
+        allTargets.forEach(target => {
+            seen.add(target.id);
+            let entry = menuRows.get(target.id);
+            if (!entry) {
+                entry = createRow(target, initialStatusFor(target, savedPrefs));
+                menuRows.set(target.id, entry);
+            }
+            patchRow(entry, target);
+            if (entry.row !== cursor) {
+                menuElement.insertBefore(entry.row, cursor);
+            } else {
+                cursor = cursor.nextSibling;
+            }
+        });
+
+        menuRows.forEach((entry, id) => {
+            if (!seen.has(id)) {
+                entry.row.remove();
+                menuRows.delete(id);
+            }
+        });
+    }
+
+    function updateElementCount() {
+        const countDiv = document.getElementById("wan2gp-element-count");
+        if (countDiv) countDiv.textContent = `${allTargets.length} elements`;
+    }
+
+    function findTarget(id) {
+        return allTargets.find(t => t.id === id);
+    }
+
+    function handleMenuClick(e) {
+        e.stopPropagation(); // Prevent clicks inside menu from bubbling up and closing it
+        const button = e.target.closest("[data-action]");
+        const row = e.target.closest(".hideui-row");
+        if (!button || !row || !editMode) return;
+        const target = findTarget(row.dataset.targetId);
+        if (!target) return;
+
+        const action = button.dataset.action;
+        if (action === "star") {
+            target.default = target.default === false;
+            let allElements = loadCustomElements();
+            const idx = allElements.findIndex(el => el.id === target.id);
+            if (idx !== -1) {
+                allElements[idx].default = target.default;
+                saveCustomElements(allElements);
+            }
+            renderRow(target);
+        } else if (action === "rename") {
+            const newName = prompt(`Rename "${target.name}":`, target.name);
+            if (newName && newName !== target.name) {
+                target.name = newName;
+                let allElements = loadCustomElements();
+                const idx = allElements.findIndex(el => el.id === target.id);
+                if (idx !== -1) {
+                    allElements[idx].name = newName;
+                    saveCustomElements(allElements);
+                }
+                renderRow(target);
+            }
+        } else if (action === "delete") {
+            if (confirm(`Delete "${target.name}"?`)) {
+                let allElements = loadCustomElements();
+                allElements = allElements.filter(el => el.id !== target.id);
+                saveCustomElements(allElements);
+                allTargets = allTargets.filter(t => t.id !== target.id);
+                orderRanks = buildOrderRanks(allTargets.map(t => t.id));
+                menuRows.get(target.id).row.remove();
+                menuRows.delete(target.id);
+                updateElementCount();
+            }
+        }
+    }
+
+    function handleMenuChange(e) {
+        const checkbox = e.target;
+        const row = checkbox.closest(".hideui-row");
+        if (!row || !checkbox.classList.contains("hideui-check")) return;
+        const states = new Map([[row.dataset.targetId, checkbox.checked]]);
+        applyVisibility(states);
+        savePreferences(states);
+    }
+
+    function handleDragStart(e) {
+        const row = e.target.closest(".hideui-row");
+        if (!row || !editMode) {
+            e.preventDefault();
+            return;
+        }
+        e.dataTransfer.effectAllowed = "move";
+        e.dataTransfer.setData("text/plain", row.dataset.targetId);
+        row.classList.add("is-dragging");
+    }
+
+    function handleDragEnd(e) {
+        const row = e.target.closest(".hideui-row");
+        if (row) row.classList.remove("is-dragging");
+
+        // Persist once per drag, not once per drop
+        if (orderDirty) {
+            orderDirty = false;
+            saveCustomElements(allTargets);
+            saveElementOrder();
+        }
+    }
+
+    function handleDragOver(e) {
+        const row = e.target.closest(".hideui-row");
+        if (!row) return;
+        e.preventDefault();
+        e.dataTransfer.dropEffect = "move";
+        row.classList.add("is-drop-target");
+    }
+
+    function handleDragLeave(e) {
+        const row = e.target.closest(".hideui-row");
+        if (row && !row.contains(e.relatedTarget)) row.classList.remove("is-drop-target");
+    }
+
+    function handleDrop(e) {
+        const toRow = e.target.closest(".hideui-row");
+        if (!toRow) return;
+        e.preventDefault();
+        toRow.classList.remove("is-drop-target");
+        const fromId = e.dataTransfer.getData("text/plain");
+        const fromIndex = orderRanks.get(fromId);
+        const toIndex = orderRanks.get(toRow.dataset.targetId);
+        if (fromIndex === undefined || toIndex === undefined || fromIndex === toIndex) return;
+
+        // Move the one row node and re-rank only the shifted range
+        const item = allTargets.splice(fromIndex, 1)[0];
+        allTargets.splice(toIndex, 0, item);
+        for (let i = Math.min(fromIndex, toIndex); i <= Math.max(fromIndex, toIndex); i++) {
+            orderRanks.set(allTargets[i].id, i);
+        }
+        const fromRow = menuRows.get(fromId).row;
+        menuElement.insertBefore(fromRow, fromIndex < toIndex ? toRow.nextSibling : toRow);
+        orderDirty = true;
+    }
+
+    function createUI() {
+        if (document.getElementById("floating-toggle-container")) return;
+
+        if (!document.getElementById(MENU_STYLE_ID)) {
+            const style = document.createElement("style");
+            style.id = MENU_STYLE_ID;
+            style.textContent = MENU_CSS;
+            document.head.appendChild(style);
+        }
+
+        const container = document.createElement("div");
+        container.id = "floating-toggle-container";
+        Object.assign(container.style, {
+            position: "fixed", bottom: "16px", right: "16px", zIndex: "999999",
+            display: "flex", flexDirection: "column", alignItems: "flex-end", gap: "10px"
+        });
+
+        const menu = document.createElement("div");
+        menu.id = "floating-menu";
+        Object.assign(menu.style, {
+            background: "rgba(30, 30, 30, 0.95)", border: "1px solid #444", borderRadius: "8px",
+            padding: "10px", display: "none", flexDirection: "column", gap: "8px",
+            minWidth: "220px", boxShadow: "0 4px 12px rgba(0,0,0,0.5)", color: "white",
+            maxHeight: "70vh", overflowY: "auto"
+        });
+
+        menu.addEventListener("click", handleMenuClick);
+        menu.addEventListener("change", handleMenuChange);
+        menu.addEventListener("dragstart", handleDragStart);
+        menu.addEventListener("dragend", handleDragEnd);
+        menu.addEventListener("dragover", handleDragOver);
+        menu.addEventListener("dragleave", handleDragLeave);
+        menu.addEventListener("drop", handleDrop);
+
+        // Store global reference for buildMenuContent
+        menuElement = menu;
+
+        // Main toggle button
+        const mainBtn = document.createElement("button");
+        mainBtn.textContent = "☰ UI";
+        Object.assign(mainBtn.style, {
+            padding: "10px 16px", borderRadius: "24px",
+            background: "#0284c7", color: "white", border: "none", cursor: "pointer",
+            boxShadow: "0 2px 8px rgba(0,0,0,0.4)", fontWeight: "bold"
+        });
+
+        mainBtn.onclick = () => {
+            const isHidden = menu.style.display === "none";
+            if (isHidden && !menuHeader) buildMenuContent(); // Rows are built on first open
+            menu.style.display = isHidden ? "flex" : "none";
+            mainBtn.textContent = isHidden ? "✕ Close" : "☰ UI";
+
+            // Exit picker mode if menu is closed
+            if (!isHidden && pickerMode) {
+                exitPickerMode();
+            }
+        };
+
+        container.appendChild(menu);
+        container.appendChild(mainBtn);
+        document.body.appendChild(container);
+    }
+
+    function formatStats() {
+        const longTasks = stats.longTasks;
+        const lines = [
+            `boot ${lifecycle.bootMs === null ? "-" : lifecycle.bootMs.toFixed(1)}ms, ${lifecycle.updates} page updates`,
+            `${stats.nodesScanned} nodes scanned, ${stats.innerTextReads} innerText reads`,
+            `${longTasks.count} long tasks, ${longTasks.hideui} overlap HideUI (${longTasks.hideuiMs.toFixed(0)}ms)`
+        ];
+        Object.entries(stats.calls).forEach(([name, call]) => {
+            lines.push(`${name}: ${call.count}x ${call.totalMs.toFixed(1)}ms (max ${call.maxMs.toFixed(1)})`);
+        });
+        return lines.join("\n");
+    }
+
+    // Small read-only view of window.__hideuiStats, refreshed while open
+    function createStatsPanel() {
+        const panel = document.createElement("div");
+        panel.id = "wan2gp-stats-panel";
+        Object.assign(panel.style, {
+            fontFamily: "monospace",
+            fontSize: "10px",
+            whiteSpace: "pre",
+            overflowX: "auto",
+            opacity: "0.8",
+            background: "#111827",
+            borderRadius: "4px",
+            padding: "6px",
+            marginBottom: "8px"
+        });
+        panel.textContent = formatStats();
+        const timer = setInterval(() => {
+            if (!panel.isConnected) {
+                clearInterval(timer);
+            } else if (menuElement.style.display !== "none") {
+                panel.textContent = formatStats();
+            }
+        }, 1000);
+        return panel;
+    }
+
+    function buildMenuHeader() {
+        const headerDiv = document.createElement("div");
+        Object.assign(headerDiv.style,{
+            fontWeight: "bold",
+            borderBottom: "1px solid #555",
+            paddingBottom: "8px",
+            marginBottom: "4px"
+        });
+
+        if (editMode) {
+            // Edit mode: element count and action buttons at top
+            const countDiv = document.createElement("div");
+            countDiv.style.fontSize = "12px";
+            countDiv.style.opacity = "0.7";
+            countDiv.style.marginBottom = "8px";
+            countDiv.id = "wan2gp-element-count";
+            countDiv.textContent = `${allTargets.length} elements`;
+            headerDiv.appendChild(countDiv);
+            headerDiv.appendChild(createStatsPanel());
+
+            // Add Element button
+            const addBtn = document.createElement("button");
+            addBtn.id = "wan2gp-add-element-btn";
+            addBtn.textContent = "➕ Add New Element";
+            Object.assign(addBtn.style, {
+                width: "100%",
+                padding: "6px 12px",
+                fontSize: "12px",
+                background: "#2563eb",  // Blue
+                color: "white",
+                border: "none",
+                borderRadius: "4px",
+                cursor: "pointer",
+                marginBottom: "4px"
+            });
+            addBtn.onclick = (e) => {
+                e.stopPropagation(); // Prevent menu from closing
+                if (pickerMode) {
+                    exitPickerMode();
+                } else {
+                    enterPickerMode();
+                }
+            };
+            headerDiv.appendChild(addBtn);
+
+            // Export and Reset buttons (side by side, grey)
+            const exportResetContainer = document.createElement("div");
+            Object.assign(exportResetContainer.style, {
+                display: "flex",
+                gap: "4px",
+                marginBottom: "8px"
+            });
+
+            // Export button
+            const exportBtn = document.createElement("button");
+            exportBtn.textContent = "📤 Export";
+            Object.assign(exportBtn.style, {
+                flex: "1",
+                padding: "6px 12px",
+                fontSize: "12px",
+                background: "#374151",
+                color: "white",
+                border: "none",
+                borderRadius: "4px",
+                cursor: "pointer"
+            });
+            exportBtn.onclick = (e) => {
+                e.stopPropagation(); // Prevent menu from closing
+                const config = {
+                    elements: exportedElements(),
+                    prefs: loadPreferences(),
+                    order: loadElementOrder(),
+                    profiles: loadProfiles()
+                };
+                const jsonStr = JSON.stringify(config, null, 2);
+
+                // Create modal to show JSON
+                const modal = document.createElement("div");
+                Object.assign(modal.style, {
+                    position: "fixed",
+                    top: "50%",
+                    left: "50%",
+                    transform: "translate(-50%, -50%)",
+                    background: "#1f2937",
+                    padding: "20px",
+                    borderRadius: "8px",
+                    boxShadow: "0 4px 20px rgba(0,0,0,0.5)",
+                    zIndex: "10001",
+                    maxWidth: "600px",
+                    width: "90%"
+                });
+
+                const title = document.createElement("h3");
+                title.textContent = "Export Configuration";
+                title.style.marginTop = "0";
+                title.style.color = "white";
+                modal.appendChild(title);
+
+                const instructions = document.createElement("p");
+                instructions.textContent = "Copy this JSON and paste it into config.json, then click Reset.";
+                instructions.style.color = "#9ca3af";
+                instructions.style.fontSize = "13px";
+                modal.appendChild(instructions);
+
+                const textarea = document.createElement("textarea");
+                textarea.value = jsonStr;
+                textarea.readOnly = true;
+                Object.assign(textarea.style, {
+                    width: "100%",
+                    height: "300px",
+                    fontFamily: "monospace",
+                    fontSize: "12px",
+                    padding: "10px",
+                    background: "#111827",
+                    color: "#f3f4f6",
+                    border: "1px solid #374151",
+                    borderRadius: "4px",
+                    resize: "vertical"
+                });
+                textarea.onclick = () => textarea.select();
+                modal.appendChild(textarea);
+
+                const btnContainer = document.createElement("div");
+                Object.assign(btnContainer.style, {
+                    marginTop: "12px",
+                    display: "flex",
+                    gap: "8px"
+                });
+
+                const copyBtn = document.createElement("button");
+                copyBtn.textContent = "📋 Copy";
+                Object.assign(copyBtn.style, {
+                    flex: "1",
+                    padding: "8px",
+                    background: "#16a34a",
+                    color: "white",
+                    border: "none",
+                    borderRadius: "4px",
+                    cursor: "pointer"
+                });
+                copyBtn.onclick = () => {
+                    textarea.select();
+                    document.execCommand('copy');
+                    copyBtn.textContent = "✓ Copied!";
+                    setTimeout(() => copyBtn.textContent = "📋 Copy", 2000);
+                };
+
+                const closeBtn = document.createElement("button");
+                closeBtn.textContent = "Close";
+                Object.assign(closeBtn.style, {
+                    flex: "1",
+                    padding: "8px",
+                    background: "#6b7280",
+                    color: "white",
+                    border: "none",
+                    borderRadius: "4px",
+                    cursor: "pointer"
+                });
+                closeBtn.onclick = () => document.body.removeChild(modal);
+
+                btnContainer.appendChild(copyBtn);
+                btnContainer.appendChild(closeBtn);
+                modal.appendChild(btnContainer);
+
+                document.body.appendChild(modal);
+                textarea.select();
+            };
+            exportResetContainer.appendChild(exportBtn);
+
+            // Save Profile button
+            const profileBtn = document.createElement("button");
+            profileBtn.textContent = "💾 Save Profile";
+            Object.assign(profileBtn.style, {
+                flex: "1",
+                padding: "6px 12px",
+                fontSize: "12px",
+                background: "#374151",
+                color: "white",
+                border: "none",
+                borderRadius: "4px",
+                cursor: "pointer"
+            });
+            profileBtn.onclick = (e) => {
+                e.stopPropagation(); // Prevent menu from closing
+                const name = prompt("Save the current visibility as profile:");
+                if (name && name.trim()) {
+                    saveCurrentAsProfile(name.trim());
+                }
+            };
+            exportResetContainer.appendChild(profileBtn);
+
+            // Reset button
+            const resetBtn = document.createElement("button");
+            resetBtn.textContent = "🗑️ Clear Cached";
+            Object.assign(resetBtn.style, {
+                flex: "1",
+                padding: "6px 12px",
+                fontSize: "12px",
+                background: "#374151",
+                color: "white",
+                border: "none",
+                borderRadius: "4px",
+                cursor: "pointer"
+            });
+            resetBtn.onclick = (e) => {
+                e.stopPropagation(); // Prevent menu from closing
+                if (confirm("Clear all localStorage changes and reload from config.json?\\n\\nMake sure you've saved your Export first!")) {
+                    resetStore();
+                    localStorage.removeItem(STORAGE_KEY_HASH);
+                    localStorage.removeItem(STORAGE_KEY_BASE);
+                    localStorage.removeItem(STORAGE_KEY_CUSTOM);
+                    localStorage.removeItem(STORAGE_KEY_PREFS);
+                    localStorage.removeItem(STORAGE_KEY_ORDER);
+                    localStorage.removeItem(STORAGE_KEY_PROFILES);
+                    location.reload();
+                }
+            };
+            exportResetContainer.appendChild(resetBtn);
+            headerDiv.appendChild(exportResetContainer);
+
+            // Finished Editing button
+            const editToggleBtn = document.createElement("button");
+            editToggleBtn.textContent = "✔️ Finished Editing";
+            Object.assign(editToggleBtn.style, {
+                width: "100%",
+                padding: "6px 12px",
+                fontSize: "12px",  // Same as other buttons
+                background: "#16a34a",  // Green
+                color: "white",
+                border: "none",
+                borderRadius: "4px",
+                cursor: "pointer",
+                marginBottom: "0",
+                fontWeight: "bold"
+            });
+            editToggleBtn.onclick = (e) => {
+                e.stopPropagation();
+                localStorage.setItem('wan2gp_hideui_editMode', 'false');
+                editMode = false;
+                buildMenuContent(); // Rebuild menu content without closing
+            };
+            headerDiv.appendChild(editToggleBtn);
+        } else {
+            // Normal mode: Show Default button prominent, Edit button small and grey
+
+            // Show Default button (large and colorful)
+            const hideDefaultBtn = document.createElement("button");
+            hideDefaultBtn.textContent = "Show Default";
+            Object.assign(hideDefaultBtn.style, {
+                width: "100%",
+                padding: "10px 12px",
+                fontSize: "14px",
+                background: "#6366f1",
+                color: "white",
+                border: "none",
+                borderRadius: "4px",
+                cursor: "pointer",
+                marginBottom: "8px",
+                fontWeight: "bold"
+            });
+            hideDefaultBtn.onclick = (e) => {
+                e.stopPropagation(); // Prevent menu from closing
+                const states = new Map();
+                allTargets.forEach(target => {
+                    const cb = document.getElementById(`cb-${target.id}`);
+                    if(cb) {
+                        // Set to default state (true for starred, false for non-starred)
+                        const defaultState = target.default !== false; // Default to true if undefined
+                        cb.checked = defaultState;
+                        states.set(target.id, defaultState);
+                    }
+                });
+                applyVisibility(states);
+                savePreferences(states);
+            };
+            headerDiv.appendChild(hideDefaultBtn);
+
+            // Profile buttons, one per saved profile
+            const profileNames = Object.keys(loadProfiles());
+            if (profileNames.length > 0) {
+                const profileContainer = document.createElement("div");
+                Object.assign(profileContainer.style, {
+                    display: "flex",
+                    flexWrap: "wrap",
+                    gap: "4px",
+                    marginBottom: "8px"
+                });
+                profileNames.forEach(name => {
+                    const btn = document.createElement("button");
+                    btn.textContent = name;
+                    btn.title = `Switch to the "${name}" profile`;
+                    Object.assign(btn.style, {
+                        flex: "1",
+                        padding: "4px 8px",
+                        fontSize: "12px",
+                        background: "#1e3a5f",
+                        color: "white",
+                        border: "none",
+                        borderRadius: "4px",
+                        cursor: "pointer"
+                    });
+                    btn.onclick = (e) => {
+                        e.stopPropagation(); // Prevent menu from closing
+                        applyProfile(name);
+                    };
+                    profileContainer.appendChild(btn);
+                });
+                headerDiv.appendChild(profileContainer);
+            }
+
+            // Button container for Show/Hide All and Edit
+            const btnContainer = document.createElement("div");
+            Object.assign(btnContainer.style, {
+                display: "flex",
+                gap: "8px",
+                marginTop: "0"
+            });
+
+            // Show/Hide All button (small grey)
+            const toggleAllBtn = document.createElement("button");
+            toggleAllBtn.textContent = "Show/Hide All";
+            Object.assign(toggleAllBtn.style, {
+                flex: "1",
+                padding: "6px 12px",
+                fontSize: "12px",
+                background: "#374151",
+                color: "white",
+                border: "none",
+                borderRadius: "4px",
+                cursor: "pointer"
+            });
+            let allHidden = false;
+            toggleAllBtn.onclick = (e) => {
+                e.stopPropagation(); // Prevent menu from closing
+                allHidden = !allHidden;
+                const states = new Map();
+                allTargets.forEach(target => {
+                    const cb = document.getElementById(`cb-${target.id}`);
+                    if(cb) {
+                        cb.checked = !allHidden;
+                        states.set(target.id, !allHidden);
+                    }
+                });
+                applyVisibility(states);
+                savePreferences(states);
+            };
+
+            // Edit button (small grey)
+            const editToggleBtn = document.createElement("button");
+            editToggleBtn.textContent = "Edit";
+            Object.assign(editToggleBtn.style, {
+                flex: "1",
+                padding: "6px 12px",
+                fontSize: "12px",
+                background: "#374151",
+                color: "white",
+                border: "none",
+                borderRadius: "4px",
+                cursor: "pointer"
+            });
+            editToggleBtn.onclick = (e) => {
+                e.stopPropagation();
+                localStorage.setItem('wan2gp_hideui_editMode', 'true');
+                editMode = true;
+                buildMenuContent(); // Rebuild menu content without closing
+            };
+
+            btnContainer.appendChild(toggleAllBtn);
+            btnContainer.appendChild(editToggleBtn);
+            headerDiv.appendChild(btnContainer);
+        }
+
+        // Separator
+        const separator1 = document.createElement("div");
+        Object.assign(separator1.style, {
+            borderTop: "1px solid #555",
+            marginTop: "8px",
+            marginBottom: "8px"
+        });
+        headerDiv.appendChild(separator1);
+
+        return headerDiv;
+    }
+
+    // Sync the menu with storage: rebuild the header only when the mode
+    // changed, patch rows by key, and apply visibility for new targets.
+    function buildMenuContent() {
+        if (!menuElement) return; // Menu not created yet
+
+        loadTargets();
+        orderRanks = buildOrderRanks(allTargets.map(t => t.id));
+
+        // Load saved preferences
+        const savedPrefs = loadPreferences();
+
+        if (headerEditMode !== editMode) {
+            const headerDiv = buildMenuHeader();
+            if (menuHeader) {
+                menuElement.replaceChild(headerDiv, menuHeader);
+            } else {
+                menuElement.insertBefore(headerDiv, menuElement.firstChild);
+            }
+            menuHeader = headerDiv;
+            headerEditMode = editMode;
+            menuElement.classList.toggle("hideui-edit", editMode);
+        }
+        updateElementCount();
+
+        renderRows(savedPrefs);
+        applyStoredVisibility(savedPrefs);
+    }
+
+    // Time the hot paths; the bindings are replaced so internal calls are counted too
+    applyVisibility = timed("applyVisibility", applyVisibility);
+    resolveTarget = timed("resolveTarget", resolveTarget);
+    findInnermostMatches = timed("findInnermostMatches", findInnermostMatches);
+    safeHide = timed("safeHide", safeHide);
+    safeShow = timed("safeShow", safeShow);
+    handlePageMutations = timed("handlePageMutations", handlePageMutations);
+    createUI = timed("createUI", createUI);
+    buildMenuContent = timed("buildMenuContent", buildMenuContent);
+    applyStoredVisibility = timed("applyStoredVisibility", applyStoredVisibility);
+
+    // --- LIFECYCLE ---
+
+    // Boot exactly once when Gradio has rendered; afterwards the page
+    // observer only handles what changed.
+    const lifecycle = { booted: false, bootMs: null, updates: 0 };
+    window.__hideuiLifecycle = lifecycle;
+    stats.lifecycle = lifecycle;
+    let bootObserver = null;
+
+    function isGradioReady() {
+        const root = document.querySelector(".gradio-container");
+        return !!root && !!root.querySelector(COMPONENT_SELECTOR);
+    }
+
+    function boot() {
+        if (lifecycle.booted || !document.body || !isGradioReady()) return;
+        lifecycle.booted = true;
+        if (bootObserver) {
+            bootObserver.disconnect();
+            bootObserver = null;
+        }
+
+        const start = performance.now();
+        observePage();
+
+        // Page visibility comes straight from storage; the menu is built
+        // the first time it is opened
+        loadTargets();
+        applyStoredVisibility();
+        console.log(`WAN2GP HideUI: ${allTargets.length} elements loaded`);
+        createUI();
+
+        // The plugin's pre-paint stylesheet is covered by our own rules now
+        const criticalStyle = document.getElementById("hideui-critical");
+        if (criticalStyle) criticalStyle.remove();
+        lifecycle.bootMs = performance.now() - start;
+        console.log(`WAN2GP HideUI: booted in ${lifecycle.bootMs.toFixed(1)}ms`);
+    }
+
+    function waitForGradio() {
+        boot();
+        if (lifecycle.booted || bootObserver || !document.body) return;
+        bootObserver = new MutationObserver(boot);
+        bootObserver.observe(document.body, { childList: true, subtree: true });
+    }
+
+    // Initialize on page load
+    window.addEventListener("gradioLoaded", waitForGradio);
+    if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", waitForGradio);
+    } else {
+        waitForGradio();
+    }
+})();
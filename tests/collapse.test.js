@@ -0,0 +1,152 @@
+"use strict";
+// Parent collapsing on nested Row/Column structures.
+// Run with: node --test tests/
+
+const test = require("node:test");
+const assert = require("node:assert");
+const { Event, boot, component, isHidden, tick } = require("./harness.js");
+
+const MAX_COLLAPSE_DEPTH = 5;
+
+// Boots the script on a page built by `build(root, add)`. `add(parent,
+// className)` appends a component-<n> div. `build` returns a map of
+// target ids to the nodes they hide; every target starts visible.
+async function setup(build) {
+    let nextId = 1;
+    const add = (parent, className) => component(parent, `component-${nextId++}`, className);
+    const { doc } = await boot(
+        targets => ({
+            elements: Object.entries(targets).map(([id, el]) => ({ id, name: id, componentId: el.id, default: true }))
+        }),
+        root => build(root, add)
+    );
+
+    // The menu rows are built on first open
+    doc.querySelector("#floating-toggle-container > button").click();
+
+    return {
+        async toggle(id, show) {
+            const checkbox = doc.getElementById(`cb-${id}`);
+            checkbox.checked = show;
+            checkbox.dispatchEvent(new Event("change", { bubbles: true }));
+            await tick();
+        }
+    };
+}
+
+function isCollapsed(el) {
+    return el.dataset.hideuiCollapsed === "true";
+}
+
+test("hiding both children of a Row collapses the Row", async () => {
+    let row, a, b;
+    const page = await setup((root, add) => {
+        row = add(root, "row");
+        a = add(row);
+        b = add(row);
+        return { a, b };
+    });
+
+    await page.toggle("a", false);
+    assert.ok(isHidden(a));
+    assert.ok(!isCollapsed(row), "one visible child keeps the Row open");
+
+    await page.toggle("b", false);
+    assert.ok(isCollapsed(row));
+    assert.ok(isHidden(row));
+});
+
+test("showing one child re-expands the Row", async () => {
+    let row, a, b;
+    const page = await setup((root, add) => {
+        row = add(root, "row");
+        a = add(row);
+        b = add(row);
+        return { a, b };
+    });
+
+    await page.toggle("a", false);
+    await page.toggle("b", false);
+    await page.toggle("a", true);
+    assert.ok(!isCollapsed(row));
+    assert.ok(!isHidden(a));
+    assert.ok(isHidden(b));
+});
+
+test("a node hidden by two targets is shown only after both are shown", async () => {
+    let row, shared, other;
+    const page = await setup((root, add) => {
+        row = add(root, "row");
+        shared = add(row);
+        other = add(row);
+        return { first: shared, second: shared, other };
+    });
+
+    await page.toggle("first", false);
+    await page.toggle("second", false);
+    await page.toggle("other", false);
+    assert.ok(isCollapsed(row));
+
+    await page.toggle("first", true);
+    assert.ok(isHidden(shared), "still hidden by the second target");
+    assert.ok(isCollapsed(row));
+
+    await page.toggle("second", true);
+    assert.ok(!isHidden(shared));
+    assert.ok(!isCollapsed(row));
+});
+
+test("a container shared by two targets stays collapsed while either hides it", async () => {
+    let column, row, leaf, sibling;
+    const page = await setup((root, add) => {
+        column = add(root, "column");
+        row = add(column, "row");
+        leaf = add(row);
+        sibling = add(column);
+        return { leaf, row, sibling };
+    });
+
+    // The leaf collapses the Row; the "row" target hides it directly
+    await page.toggle("leaf", false);
+    await page.toggle("row", false);
+    await page.toggle("sibling", false);
+    assert.ok(isCollapsed(row));
+    assert.ok(isCollapsed(column));
+
+    await page.toggle("leaf", true);
+    assert.ok(isHidden(row), "the row target still hides the Row");
+    assert.ok(isCollapsed(column));
+
+    await page.toggle("leaf", false);
+    await page.toggle("row", true);
+    assert.ok(isHidden(row), "the collapse still hides the Row");
+    assert.ok(isCollapsed(column));
+
+    await page.toggle("leaf", true);
+    assert.ok(!isHidden(row));
+    assert.ok(!isCollapsed(column));
+    assert.ok(isHidden(sibling));
+});
+
+test("a nested Column/Row chain collapses up to MAX_COLLAPSE_DEPTH", async () => {
+    const chain = [];
+    let leaf;
+    const page = await setup((root, add) => {
+        let parent = root;
+        for (let i = 0; i <= MAX_COLLAPSE_DEPTH; i++) {
+            parent = add(parent, i % 2 ? "row" : "column");
+            chain.push(parent);
+        }
+        leaf = add(parent);
+        return { leaf };
+    });
+
+    // chain[i] is MAX_COLLAPSE_DEPTH - i levels above the leaf's parent
+    await page.toggle("leaf", false);
+    chain.slice(1).forEach(node => assert.ok(isCollapsed(node), node.id));
+    assert.ok(!isCollapsed(chain[0]), "the level past the limit stays open");
+
+    await page.toggle("leaf", true);
+    chain.forEach(node => assert.ok(!isCollapsed(node), node.id));
+    assert.ok(!isHidden(leaf));
+});
@@ -0,0 +1,39 @@
+"use strict";
+// Resolving custom elements by fingerprint after Gradio renumbers ids.
+// Run with: node --test tests/
+
+const test = require("node:test");
+const assert = require("node:assert");
+const { boot, component, isHidden } = require("./harness.js");
+
+// A Row of unlabelled blocks (button rows, HTML, images) numbered from
+// `firstId`; the target starts hidden
+async function bootRow(firstId, element) {
+    const { built } = await boot(
+        { elements: [Object.assign({ id: "custom_block", name: "Block", isCustom: true, default: false }, element)] },
+        root => {
+            const row = component(root, `component-${firstId}`, "row");
+            return [1, 2, 3, 4].map(i => component(row, `component-${firstId + i}`));
+        }
+    );
+    return built;
+}
+
+// Picked as the third block: body > gradio-container > row > block
+const PICKED = { componentId: "component-3", fingerprint: { path: [0, 0, 2] } };
+
+test("an unlabelled block resolves by its id while the layout is unchanged", async () => {
+    const blocks = await bootRow(0, PICKED);
+    assert.deepStrictEqual(blocks.map(isHidden), [false, false, true, false]);
+});
+
+test("a renumbered id pointing at another block falls back to the path", async () => {
+    // component-3 is now the second block
+    const blocks = await bootRow(1, PICKED);
+    assert.deepStrictEqual(blocks.map(isHidden), [false, false, true, false]);
+});
+
+test("entries without a fingerprint still resolve by componentId", async () => {
+    const blocks = await bootRow(1, { componentId: "component-3" });
+    assert.deepStrictEqual(blocks.map(isHidden), [false, true, false, false]);
+});
@@ -0,0 +1,57 @@
+"use strict";
+// Shared setup for the node tests (and the benchmark runner): boots the
+// script on the synthetic DOM from benchmarks/dom.js.
+
+const fs = require("fs");
+const path = require("path");
+const { createWindow, runScript, Event } = require("../benchmarks/dom.js");
+
+const BUNDLE_PATH = path.join(__dirname, "..", "static", "hideui.js");
+
+const tick = () => new Promise(resolve => setTimeout(resolve, 0));
+
+// Runs `code` (the bare bundle by default) and fires Gradio's load event
+function start(window, code = fs.readFileSync(BUNDLE_PATH, "utf8")) {
+    window.console = { ...console, log: () => {} };
+    runScript(window, code);
+    window.dispatchEvent(new Event("gradioLoaded"));
+}
+
+// Appends a Gradio-like component div with the given id
+function component(parent, id, className = "block") {
+    const el = parent.ownerDocument.createElement("div");
+    el.id = id;
+    el.className = className;
+    parent.appendChild(el);
+    return el;
+}
+
+// Builds the page with `build(root)` inside a .gradio-container, then
+// boots the bundle with `config` as window.__hideuiConfig. `config` may
+// be a function of what `build` returned.
+async function boot(config, build) {
+    const window = createWindow();
+    const doc = window.document;
+    const root = doc.createElement("div");
+    root.className = "gradio-container";
+    doc.body.appendChild(root);
+
+    const built = build(root);
+    window.__hideuiConfig = Object.assign(
+        { prefs: {}, order: [], hash: "test" },
+        typeof config === "function" ? config(built) : config
+    );
+    start(window);
+    await tick();
+    return { window, doc, built };
+}
+
+// Hidden by the stylesheet, itself or through an ancestor
+function isHidden(el) {
+    for (let node = el; node && node.nodeType === 1; node = node.parentNode) {
+        if (node._hiddenByStyle()) return true;
+    }
+    return false;
+}
+
+module.exports = { Event, boot, component, isHidden, start, tick };